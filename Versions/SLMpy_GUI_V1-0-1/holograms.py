@@ -89,13 +89,9 @@ def HoloLG(l, p, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024,
         ZZ = np.linspace(0, z[0], z[1])
         dz = np.abs(ZZ[0] - ZZ[1])  # Step size
 
-        # Initialize a list to store the propagated field
-        F = [A]
-
         # Iteratively propagate the beam through the specified distance
         for _ in range(z[1]):
             A = propTF(A, 2 * maxx, 1, dz)  # Fresnel propagation
-            F.append(A)
 
     # Generate the hologram from the resulting field
     return Hologram(A, dx, dy, LA)
@@ -149,13 +145,9 @@ def HoloHG(m, n, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024,
         ZZ = np.linspace(0, z[0], z[1])
         dz = np.abs(ZZ[0] - ZZ[1])  # Step size
 
-        # Initialize a list to store the propagated field
-        F = [A]
-
         # Iteratively propagate the beam through the specified distance
         for _ in range(z[1]):
             A = propTF(A, 2 * maxx, 1, dz)  # Fresnel propagation
-            F.append(A)
 
     # Generate the hologram from the resulting field
     return Hologram(A, dx, dy, LA)
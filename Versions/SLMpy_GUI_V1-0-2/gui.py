@@ -11,13 +11,14 @@ Author: Manuel Ferrer (@mferrerg)
 from PyQt5.QtWidgets import (
     QMainWindow, QVBoxLayout, QWidget, QLabel, QComboBox, QHBoxLayout, QPushButton, QApplication
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
 from functools import partial
 import numpy as np
 import os
 from display import ArrayDisplay
 from holograms import HoloLG, HoloHG
 from config_dock import ConfigDock
+from worker import HologramWorker
 from matplotlib.colors import LinearSegmentedColormap
 import matplotlib.pyplot as plt
 
@@ -71,6 +72,13 @@ class MultiScreenController(QMainWindow):
         self.parameters = {i: {"type": None} for i in range(len(self.screens))}  # Store screen parameters
         self.config_docks = {}  # Store configuration panels
 
+        # Background hologram generation
+        self.thread_pool = QThreadPool.globalInstance()
+        self.pending_holograms = {}  # Latest hologram request per screen, waiting for its timer
+        self.debounce_timers = {}  # Coalesce quick successive requests for the same screen
+        self.request_ids = {}  # Id of the latest request per screen, older results are dropped
+        self.buffer_pool = {}  # Free hologram output arrays per screen, reused between updates
+
         # Widgets configuration for different content types
         self.widgets = {
             "LG Hologram": [
@@ -179,29 +187,38 @@ class MultiScreenController(QMainWindow):
         if content_type == "LG Hologram":
             params = self.parameters[screen_index].get("lg_hologram", {})
             pos = (-params.get("x", 0), -params.get("y", 0))
-            array = HoloLG(
+            selected_cmap = params.get("Cmap", "gray")
+            # Holograms are computed in the background, the display is updated when ready
+            self.request_hologram(screen_index, partial(
+                HoloLG,
                 params.get("l", 0), params.get("p", 0), params.get("w0", 0.2),
                 LA=params.get("LA", 0.2) / 100, SLM_Pix=resolution, position=pos
-            )
-            selected_cmap = params.get("Cmap", "gray")
+            ), selected_cmap, (resolution[1], resolution[0]))
+            return
 
         elif content_type == "HG Hologram":
             params = self.parameters[screen_index].get("hg_hologram", {})
             pos = (-params.get("x", 0), -params.get("y", 0))
-            array = HoloHG(
+            selected_cmap = params.get("Cmap", "gray")
+            self.request_hologram(screen_index, partial(
+                HoloHG,
                 params.get("m", 0), params.get("n", 0), params.get("w0", 0.2),
                 LA=params.get("LA", 0.2) / 100, SLM_Pix=resolution, position=pos
-            )
-            selected_cmap = params.get("Cmap", "gray")
+            ), selected_cmap, (resolution[1], resolution[0]))
+            return
+
+        # Any other content replaces a hologram that may still be computing
+        self.request_ids[screen_index] = self.request_ids.get(screen_index, 0) + 1
+        self.pending_holograms.pop(screen_index, None)
 
-        elif content_type == "Random Noise":
+        if content_type == "Random Noise":
             array = np.random.normal(0.5, 0.1, resolution)
 
         elif content_type == "Gradient":
-            array = np.linspace(0, 1, resolution[1])[None, :] * np.ones((resolution[0], 1))
+            array = np.linspace(0, 1, resolution[1], dtype=np.float32)[None, :] * np.ones((resolution[0], 1), dtype=np.float32)
 
         elif content_type == "Zeros":
-            array = np.zeros(resolution)
+            array = np.zeros(resolution, dtype=np.float32)
 
         elif content_type == "None":
             # print(f"[DEBUG] Closing display for Screen {screen_index}")
@@ -233,6 +250,52 @@ class MultiScreenController(QMainWindow):
             #else:
             #     print(f"[DEBUG] No valid array generated for Screen {screen_index}")  # Debug
 
+    def request_hologram(self, screen_index, func, selected_cmap, shape):
+        """
+        Schedule a hologram for the given screen.
+
+        Requests arriving within 50 ms of each other for the same screen are coalesced, so only
+        the latest parameter set is computed. `shape` is the shape of the hologram array, used
+        to pick an output buffer from the pool of the screen.
+        """
+        self.request_ids[screen_index] = self.request_ids.get(screen_index, 0) + 1
+        self.pending_holograms[screen_index] = (self.request_ids[screen_index], func, selected_cmap, shape)
+
+        if screen_index not in self.debounce_timers:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(partial(self.start_hologram, screen_index))
+            self.debounce_timers[screen_index] = timer
+        self.debounce_timers[screen_index].start(50)  # Restarts the timer if already running
+
+    def start_hologram(self, screen_index):
+        """
+        Start the latest pending hologram for the given screen on the thread pool.
+        """
+        if screen_index not in self.pending_holograms:
+            return
+        request_id, func, selected_cmap, shape = self.pending_holograms.pop(screen_index)
+
+        # Write into a free buffer of the screen. A buffer stays out of the pool while its
+        # worker runs, so two overlapping workers never share one (double buffering)
+        pool = [buf for buf in self.buffer_pool.get(screen_index, []) if buf.shape == shape]
+        out = pool.pop() if pool else np.empty(shape, dtype=np.float32)
+        self.buffer_pool[screen_index] = pool
+
+        worker = HologramWorker(screen_index, request_id, partial(func, out=out), selected_cmap)
+        worker.signals.result_ready.connect(self.hologram_ready)
+        self.thread_pool.start(worker)
+
+    def hologram_ready(self, screen_index, request_id, array, selected_cmap):
+        """
+        Display a finished hologram, unless a newer request was made for the screen meanwhile.
+        """
+        if request_id == self.request_ids.get(screen_index):
+            self.show_screen(screen_index, array, selected_cmap)
+
+        # The display keeps its own copy of the data, so the buffer can be reused right away
+        self.buffer_pool.setdefault(screen_index, []).append(array)
+
     def show_screen(self, screen_index, array, selected_cmap):
         """
         Show or update the screen with the given content.
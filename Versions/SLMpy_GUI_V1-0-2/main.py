@@ -10,6 +10,7 @@ SLMpy_GUI/
 │── gui.py                # GUI components and main window
 │── display.py            # Handles display functions for multiple screens
 │── holograms.py          # Functions related to generating holograms
+│── worker.py             # Background hologram generation on the Qt thread pool
 │── optics.py             # Special functions (Zernike polynomials, Laguerre-Gaussian, Hermite-Gaussian, etc.)
 │── propagation.py        # Propagation functions (Fresnel propagation, Fourier methods)
 │── utils.py              # Utility functions (coordinate transformations, normalization)
@@ -68,7 +68,7 @@ def Zernike(RHO, PHI, m, n):
     Returns:
         np.ndarray: Normalized Zernike polynomial values.
     """
-    ZR = np.zeros(RHO.shape)
+    ZR = np.zeros(RHO.shape, dtype=np.result_type(RHO, np.float32))
     rn = RR(np.abs(m), n)
     for ii in range(len(rn[0])):
         ZR += rn[0][ii] * RHO ** rn[1][ii]
@@ -143,7 +143,7 @@ def NHermite(n, X):
 
     """
     # Initialize the first two Hermite polynomials
-    Hn1 = np.ones(X.shape)  # H_0(x) = 1
+    Hn1 = np.ones(X.shape, dtype=np.result_type(X, np.float32))  # H_0(x) = 1
     H = 2 * X  # H_1(x) = 2x
 
     if n < 0:
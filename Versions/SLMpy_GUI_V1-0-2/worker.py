@@ -0,0 +1,61 @@
+"""
+HologramWorker - Background Hologram Generation
+
+This module defines the `HologramWorker` class, which computes holograms on a thread of the
+global `QThreadPool` so that the Qt event loop (and the configuration widgets) stay responsive
+while the FFTs and special functions run. The result is delivered back to the GUI thread with
+a signal.
+
+Author: Manuel Ferrer (@mferrerg)
+"""
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """
+    Signals emitted by `HologramWorker`.
+
+    `QRunnable` is not a `QObject`, so the signals live in this helper object. It is created
+    on the GUI thread, which makes the connected slots run on the GUI thread as well.
+    """
+    # screen_index, request id, generated array, colormap name
+    result_ready = pyqtSignal(int, int, object, str)
+
+
+class HologramWorker(QRunnable):
+    """
+    Runs a hologram function in the background and emits the generated array.
+    """
+
+    def __init__(self, screen_index, request_id, func, cmap):
+        """
+        Initializes the worker.
+
+        Parameters:
+        screen_index : int
+            The index of the screen the hologram is generated for.
+        request_id : int
+            Identifier of the request, used by the GUI to drop results that are out of date.
+        func : callable
+            Function without arguments that returns the hologram (e.g. a `partial` of `HoloLG`).
+        cmap : str
+            The colormap to apply when the hologram is displayed.
+        """
+        super().__init__()
+        self.screen_index = screen_index
+        self.request_id = request_id
+        self.func = func
+        self.cmap = cmap
+        self.signals = WorkerSignals()
+
+    def run(self):
+        """
+        Computes the hologram on the worker thread and emits the result.
+        """
+        try:
+            array = self.func()
+        except Exception as e:
+            print(f"[ERROR] Failed to generate hologram for Screen {self.screen_index}: {e}")
+            return
+        self.signals.result_ready.emit(self.screen_index, self.request_id, array, self.cmap)
@@ -7,9 +7,12 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QLabel,
     QComboBox, QHBoxLayout, QDockWidget, QFormLayout, QDoubleSpinBox, QSpinBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QEvent
 from functools import partial
 
+# Random generator shared by all noise frames (PCG64, seeded once)
+_RNG = np.random.default_rng()
+
 
 # Hologram Functions
 ################################################################################
@@ -101,13 +104,9 @@ def HoloLG(l,p,w0,z=(0,5),Z=(1,0,0,0),LA=0.005,maxx=1,SLM_Pix=(1024,780),positio
         ZZ = np.linspace(0, z[0], z[1])
         dz = np.abs(ZZ[0] - ZZ[1])  # Step size
 
-        # Initialize a list to store the propagated field
-        F = [A]
-
         # Iteratively propagate the beam through the specified distance
         for _ in range(z[1]):
             A = propTF(A, 2 * maxx, 1, dz)  # Fresnel propagation
-            F.append(A)
 
     # Generate the hologram from the resulting field
     return Hologram(A, dx, dy, LA)
@@ -163,13 +162,9 @@ def HoloHG(m,n,w0,z=(0,5),Z=(1,0,0,0),LA=0.005,maxx=1,SLM_Pix=(1024,780),positio
         ZZ = np.linspace(0, z[0], z[1])
         dz = np.abs(ZZ[0] - ZZ[1])  # Step size
 
-        # Initialize a list to store the propagated field
-        F = [A]
-
         # Iteratively propagate the beam through the specified distance
         for _ in range(z[1]):
             A = propTF(A, 2 * maxx, 1, dz)  # Fresnel propagation
-            F.append(A)
 
     # Generate the hologram from the resulting field
     return Hologram(A, dx, dy, LA)
@@ -474,15 +469,45 @@ def Chop(A):
         - numpy.ndarray: Array with small values set to zero.
     """
         
-    return (
-        np.real(A) * (np.abs(np.real(A)) > 1e-8) +
-        np.imag(A) * (np.abs(np.imag(A)) > 1e-8)
-    )
+    # Chopped real part, written in place on a single copy
+    out = np.real(A).copy()
+    out[np.abs(out) <= 1e-8] = 0
+
+    # Add the chopped imaginary part, only where it is above the threshold
+    im = np.imag(A)
+    np.add(out, im, out=out, where=np.abs(im) > 1e-8)
+    return out
 
 ##############################################################################################
 # SLM code 
 ##############################################################################################
 
+# Screen size changes (in pixels) too small to be worth recomputing a hologram for
+RESOLUTION_TOLERANCE = 2
+
+# Configuration dock widgets (labels and inputs) shown for each content type
+CONFIG_FIELDS = {
+    "Gradient": frozenset({
+        "gradient_direction_label", "gradient_direction_combo",
+        "gradient_scale_label", "gradient_scale_spinbox",
+    }),
+    "Random Noise": frozenset({
+        "noise_mean_label", "noise_mean_spinbox",
+        "noise_std_label", "noise_std_spinbox",
+    }),
+    "Laguerre-Gaussian Hologram": frozenset({
+        "l_label", "l_spinbox", "p_label", "p_spinbox",
+        "w0lg_label", "w0lg_spinbox", "LAlg_label", "LAlg_spinbox",
+        "Xlg_label", "Xlg_spinbox", "Ylg_label", "Ylg_spinbox",
+    }),
+    "Hermite-Gaussian Hologram": frozenset({
+        "m_label", "m_spinbox", "n_label", "n_spinbox",
+        "w0hg_label", "w0hg_spinbox", "LAhg_label", "LAhg_spinbox",
+        "Xhg_label", "Xhg_spinbox", "Yhg_label", "Yhg_spinbox",
+    }),
+}
+
+
 class ArrayDisplay(QMainWindow):
     """
     A window to display content on a specific screen.
@@ -490,6 +515,7 @@ class ArrayDisplay(QMainWindow):
     def __init__(self, array, screen_index):
         super().__init__()
         self.setWindowTitle(f'Display Array on Screen {screen_index}')
+        self._pending = None  # Latest update deferred while the window was hidden or minimized
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
         self.layout = QVBoxLayout(self.central_widget)
@@ -515,13 +541,54 @@ class ArrayDisplay(QMainWindow):
         else:
             print(f"Screen {screen_index} is not available. Defaulting to primary screen.")
 
+    def is_showing(self):
+        """
+        Whether the window is on screen (visible and not minimized).
+        """
+        return self.isVisible() and not self.isMinimized()
+
+    def defer(self, update):
+        """
+        Keep `update` (a callable without arguments) to run once the window is on screen
+        again. Only the latest deferred update is kept.
+        """
+        self._pending = update
+
     def update_array(self, new_array):
         """
-        Update the displayed array.
+        Update the displayed array. While the window is hidden or minimized only the
+        latest array is kept, and it is drawn once the window is shown again.
         """
+        if not self.is_showing():
+            self.defer(partial(self.update_array, new_array))
+            return
+        self._pending = None
         self.image.set_data(new_array)
         self.canvas.draw()
 
+    def _flush_pending(self):
+        """
+        Run the update deferred while the window was hidden or minimized, if any.
+        """
+        if self._pending is not None and self.is_showing():
+            update, self._pending = self._pending, None
+            update()
+
+    def showEvent(self, event):
+        """
+        Run the update that arrived while the window was hidden, if any.
+        """
+        super().showEvent(event)
+        self._flush_pending()
+
+    def changeEvent(self, event):
+        """
+        Run the update that arrived while the window was minimized, once it is restored.
+        """
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self._flush_pending()
+
 
 class MultiScreenController(QMainWindow):
     """
@@ -546,6 +613,14 @@ class MultiScreenController(QMainWindow):
             for i in range(len(self.screens))
         }
         self.config_docks = {}  # Store docks for each screen
+        self._holo_cache = {}  # Last hologram shown on each screen: {screen_index: (key, array)}
+        self._visible_fields = {i: frozenset() for i in range(len(self.screens))}  # Shown config widgets
+
+        # Display updates requested within 50 ms of each other are rendered once
+        self._pending_update = set()
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self._flush_updates)
 
         self.init_ui()
 
@@ -806,157 +881,16 @@ class MultiScreenController(QMainWindow):
         config = self.config_docks[screen_index]
         dock = config["dock"]
 
-        # Show or hide relevant labels and fields based on content type
-        if content_type == "Gradient":
-            config["gradient_direction_label"].show()
-            config["gradient_direction_combo"].show()
-            config["gradient_scale_label"].show()
-            config["gradient_scale_spinbox"].show()
-            
-            config["noise_mean_label"].hide()
-            config["noise_mean_spinbox"].hide()
-            config["noise_std_label"].hide()
-            config["noise_std_spinbox"].hide()
-            
-            config["l_label"].hide()
-            config["l_spinbox"].hide()
-            config["p_label"].hide()
-            config["p_spinbox"].hide()
-            config["w0lg_label"].hide()
-            config["w0lg_spinbox"].hide()
-            config["LAlg_label"].hide()
-            config["LAlg_spinbox"].hide()
-            config["Xlg_label"].hide()
-            config["Xlg_spinbox"].hide()
-            config["Ylg_label"].hide()
-            config["Ylg_spinbox"].hide()
-            
-            config["m_label"].hide()
-            config["m_spinbox"].hide()
-            config["n_label"].hide()
-            config["n_spinbox"].hide()
-            config["w0hg_label"].hide()
-            config["w0hg_spinbox"].hide()
-            config["LAhg_label"].hide()
-            config["LAhg_spinbox"].hide()
-            config["Xhg_label"].hide()
-            config["Xhg_spinbox"].hide()
-            config["Yhg_label"].hide()
-            config["Yhg_spinbox"].hide()
-            dock.show()
-            
-        elif content_type == "Random Noise":
-            config["gradient_direction_label"].hide()
-            config["gradient_direction_combo"].hide()
-            config["gradient_scale_label"].hide()
-            config["gradient_scale_spinbox"].hide()
-            
-            config["noise_mean_label"].show()
-            config["noise_mean_spinbox"].show()
-            config["noise_std_label"].show()
-            config["noise_std_spinbox"].show()
-            
-            config["l_label"].hide()
-            config["l_spinbox"].hide()
-            config["p_label"].hide()
-            config["p_spinbox"].hide()
-            config["w0lg_label"].hide()
-            config["w0lg_spinbox"].hide()
-            config["LAlg_label"].hide()
-            config["LAlg_spinbox"].hide()
-            config["Xlg_label"].hide()
-            config["Xlg_spinbox"].hide()
-            config["Ylg_label"].hide()
-            config["Ylg_spinbox"].hide()
-            
-            config["m_label"].hide()
-            config["m_spinbox"].hide()
-            config["n_label"].hide()
-            config["n_spinbox"].hide()
-            config["w0hg_label"].hide()
-            config["w0hg_spinbox"].hide()
-            config["LAhg_label"].hide()
-            config["LAhg_spinbox"].hide()
-            config["Xhg_label"].hide()
-            config["Xhg_spinbox"].hide()
-            config["Yhg_label"].hide()
-            config["Yhg_spinbox"].hide()
-            dock.show()
-            
-        elif content_type == "Laguerre-Gaussian Hologram":
-            config["gradient_direction_label"].hide()
-            config["gradient_direction_combo"].hide()
-            config["gradient_scale_label"].hide()
-            config["gradient_scale_spinbox"].hide()
-            
-            config["noise_mean_label"].hide()
-            config["noise_mean_spinbox"].hide()
-            config["noise_std_label"].hide()
-            config["noise_std_spinbox"].hide()
-            
-            config["l_label"].show()
-            config["l_spinbox"].show()
-            config["p_label"].show()
-            config["p_spinbox"].show()
-            config["w0lg_label"].show()
-            config["w0lg_spinbox"].show()
-            config["LAlg_label"].show()
-            config["LAlg_spinbox"].show()
-            config["Xlg_label"].show()
-            config["Xlg_spinbox"].show()
-            config["Ylg_label"].show()
-            config["Ylg_spinbox"].show()
-            
-            config["m_label"].hide()
-            config["m_spinbox"].hide()
-            config["n_label"].hide()
-            config["n_spinbox"].hide()
-            config["w0hg_label"].hide()
-            config["w0hg_spinbox"].hide()
-            config["LAhg_label"].hide()
-            config["LAhg_spinbox"].hide()
-            config["Xhg_label"].hide()
-            config["Xhg_spinbox"].hide()
-            config["Yhg_label"].hide()
-            config["Yhg_spinbox"].hide()
-            dock.show()
-            
-        elif content_type == "Hermite-Gaussian Hologram":
-            config["gradient_direction_label"].hide()
-            config["gradient_direction_combo"].hide()
-            config["gradient_scale_label"].hide()
-            config["gradient_scale_spinbox"].hide()
-            
-            config["noise_mean_label"].hide()
-            config["noise_mean_spinbox"].hide()
-            config["noise_std_label"].hide()
-            config["noise_std_spinbox"].hide()
-            
-            config["m_label"].show()
-            config["m_spinbox"].show()
-            config["n_label"].show()
-            config["n_spinbox"].show()
-            config["w0hg_label"].show()
-            config["w0hg_spinbox"].show()
-            config["LAhg_label"].show()
-            config["LAhg_spinbox"].show()
-            config["Xhg_label"].show()
-            config["Xhg_spinbox"].show()
-            config["Yhg_label"].show()
-            config["Yhg_spinbox"].show()
-            
-            config["l_label"].hide()
-            config["l_spinbox"].hide()
-            config["p_label"].hide()
-            config["p_spinbox"].hide()
-            config["w0lg_label"].hide()
-            config["w0lg_spinbox"].hide()
-            config["LAlg_label"].hide()
-            config["LAlg_spinbox"].hide()
-            config["Xlg_label"].hide()
-            config["Xlg_spinbox"].hide()
-            config["Ylg_label"].hide()
-            config["Ylg_spinbox"].hide()
+        # Show or hide relevant labels and fields based on content type,
+        # touching only the widgets whose visibility actually changes
+        if content_type in CONFIG_FIELDS:
+            fields = CONFIG_FIELDS[content_type]
+            visible = self._visible_fields[screen_index]
+            for key in visible - fields:
+                config[key].hide()
+            for key in fields - visible:
+                config[key].show()
+            self._visible_fields[screen_index] = fields
             dock.show()
         else:
             dock.hide()
@@ -1005,10 +939,12 @@ class MultiScreenController(QMainWindow):
         Generate a gradient based on the provided parameters.
         """
         scale = params["scale"]
+        # A single ramp broadcast to the full resolution (read-only view, no H x W copy)
         if params["direction"] == "Horizontal":
-            return np.linspace(0, scale, resolution[1])[None, :] * np.ones((resolution[0], 1))
+            ramp = np.linspace(0, scale, resolution[1], dtype=np.float32)[None, :]
         else:
-            return np.linspace(0, scale, resolution[0])[:, None] * np.ones((1, resolution[1]))
+            ramp = np.linspace(0, scale, resolution[0], dtype=np.float32)[:, None]
+        return np.broadcast_to(ramp, (resolution[0], resolution[1]))
 
     def generate_random_noise(self, params, resolution=(1080, 1920)):
         """
@@ -1016,7 +952,10 @@ class MultiScreenController(QMainWindow):
         """
         mean = params["mean"]
         std = params["std"]
-        return np.random.normal(mean, std, resolution)
+        noise = _RNG.standard_normal(resolution, dtype=np.float32)
+        noise *= std
+        noise += mean
+        return noise
     
     def generate_holo_lg(self, params, resolution=(1080, 1920)):
         """
@@ -1041,9 +980,32 @@ class MultiScreenController(QMainWindow):
         return HoloHG(n, m, w0, LA=La/100, SLM_Pix=resolution,position=pos)
 
     def update_display(self, screen_index):
+        """
+        Schedule an update of the display for the specified screen. Requests arriving
+        in quick succession are coalesced into a single render per screen.
+        """
+        self._pending_update.add(screen_index)
+        self._update_timer.start(50)
+
+    def _flush_updates(self):
+        """
+        Render every screen with a pending update.
+        """
+        pending, self._pending_update = self._pending_update, set()
+        for screen_index in sorted(pending):
+            self.render_display(screen_index)
+
+    def render_display(self, screen_index):
         """
         Update the display for the specified screen based on the current parameters.
+        While its window is hidden or minimized nothing is generated: the render is
+        deferred until the window is on screen again.
         """
+        display = self.displays.get(screen_index)
+        if display is not None and not display.is_showing():
+            display.defer(partial(self.render_display, screen_index))
+            return
+
         content_type = self.parameters[screen_index]["type"]
         step1 = self.screens[screen_index]
         resolution=(step1.geometry().height(),step1.geometry().width())
@@ -1052,10 +1014,8 @@ class MultiScreenController(QMainWindow):
 
         if content_type == "Gradient":
             array = self.generate_gradient(self.parameters[screen_index]["gradient"], resolution2)
-        elif content_type == "Laguerre-Gaussian Hologram":
-            array = self.generate_holo_lg(self.parameters[screen_index]["holo_lg"], resolution2)
-        elif content_type == "Hermite-Gaussian Hologram":
-            array = self.generate_holo_hg(self.parameters[screen_index]["holo_hg"], resolution2)
+        elif content_type in ("Laguerre-Gaussian Hologram", "Hermite-Gaussian Hologram"):
+            array = self.cached_hologram(screen_index, content_type, resolution2)
         elif content_type == "Random Noise":
             array = self.generate_random_noise(self.parameters[screen_index]["noise"], resolution2)
         elif content_type == "Zeros":
@@ -1064,6 +1024,29 @@ class MultiScreenController(QMainWindow):
         if array is not None:
             self.show_screen(screen_index, array)
 
+    def cached_hologram(self, screen_index, content_type, resolution):
+        """
+        Return the hologram for a screen, regenerating it only when its parameters
+        or the screen resolution changed since it was last computed. Resolution changes
+        of up to RESOLUTION_TOLERANCE pixels (geometry noise while the window manager
+        places the window) keep the cached hologram. Only the last hologram of each screen
+        is kept, in float32 to halve its footprint.
+        """
+        if content_type == "Laguerre-Gaussian Hologram":
+            params, generate = self.parameters[screen_index]["holo_lg"], self.generate_holo_lg
+        else:
+            params, generate = self.parameters[screen_index]["holo_hg"], self.generate_holo_hg
+
+        key = (content_type, tuple(sorted(params.items())), tuple(resolution))
+        cached = self._holo_cache.get(screen_index)
+        if cached is not None and cached[0][:2] == key[:2] and all(
+                abs(new - old) <= RESOLUTION_TOLERANCE for new, old in zip(key[2], cached[0][2])):
+            return cached[1]
+
+        array = generate(params, resolution).astype(np.float32, copy=False)
+        self._holo_cache[screen_index] = (key, array)
+        return array
+
     def show_screen(self, screen_index, array):
         """
         Show or update the screen with the given content.
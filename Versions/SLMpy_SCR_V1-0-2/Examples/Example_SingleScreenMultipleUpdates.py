@@ -1,6 +1,7 @@
 import sys
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from PyQt5.QtWidgets import QApplication
 from slm import SLM, get_screen_info, load_colormaps
@@ -48,8 +49,14 @@ Screen1 = SLM(1, holo1,cmap_dict['PlutoC'])  # Screen 1 with holo1 using the Plu
 
 waist=np.linspace(0.05,0.1,10)
 
-# List of predefined holograms to display sequentially
-holograms = [HoloLG(l=1, p=0, w0=w, LA=0.001, SLM_Pix=(1920, 1080)) for w in waist]
+# List of predefined holograms to display sequentially. They are computed in a background
+# thread (NumPy and the compiled kernels release the GIL), so the event loop starts right
+# away; each entry is a future whose .result() waits only if that hologram is not ready yet.
+# A single worker: the kernels are already parallel across the cores, and several of their
+# parallel regions entered at once can oversubscribe the CPU or abort numba's workqueue layer.
+executor = ThreadPoolExecutor(max_workers=1)
+holograms = [executor.submit(HoloLG, l=1, p=0, w0=w, LA=0.001, SLM_Pix=(1920, 1080)) for w in waist]
+executor.shutdown(wait=False)
 
 
 # Time interval (in milliseconds) between updates (5 seconds)
@@ -69,7 +76,7 @@ def update_sequence(index=0):
         - Stops automatically when all holograms have been displayed.
     """
     if index < len(holograms):  # Ensure index is within bounds
-        Screen1.update(holograms[index])  # Update the screen with the current hologram
+        Screen1.update(holograms[index].result())  # Update the screen with the current hologram
         
         # Schedule the next hologram update after `update_interval` milliseconds
         QTimer.singleShot(update_interval, lambda: update_sequence(index + 1))
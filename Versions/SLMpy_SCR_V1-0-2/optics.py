@@ -1,5 +1,49 @@
 import numpy as np
 import math
+import os
+from functools import lru_cache
+
+# Ahead-of-time compiled kernels, built by running optics_compiled.py once
+try:
+    import optics_nb
+except ImportError:
+    optics_nb = None
+
+# Just-in-time compiled kernels, used when the compiled extension has not been built
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Multithreaded single-pass evaluation of the element-wise field expressions
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# FFT backend for propTF: pyFFTW with cached plans, else multithreaded scipy.fft, else numpy.fft
+try:
+    import pyfftw
+    import pyfftw.interfaces.numpy_fft as _fft
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(30)
+    _fft_kwargs = {'threads': os.cpu_count() or 1}
+except ImportError:
+    try:
+        import scipy.fft as _fft
+        _fft_kwargs = {'workers': -1}
+    except ImportError:
+        _fft = np.fft
+        _fft_kwargs = {}
+
+# CUDA propagation from optics_gpu.py when CuPy and a GPU are available. CuPy raises its own
+# CUDA errors (not ImportError) when it is installed on a machine without a usable device.
+try:
+    import cupy as cp
+    cp.cuda.runtime.getDeviceCount()
+    import optics_gpu
+except Exception:
+    optics_gpu = None
 
 def cart2pol(x, y):
     rho = np.sqrt(x**2 + y**2)
@@ -16,40 +60,39 @@ def cart2pol(x, y):
 # - RHO, PHI: Polar coordinates.
 # - m, n: Azimuthal and radial indices.
 
-# Coeffcients and powers or the radial Polynomials
+# Coeffcients of the radial Polynomials
+@lru_cache(maxsize=128)
 def RR(m,n):
     """
-    Compute coefficients and powers for the radial polynomial of Zernike functions.
+    Compute the coefficients of the radial polynomial of Zernike functions.
     
     Parameters:
         - m (int): Azimuthal index (absolute value used internally).
         - n (int): Radial index.
 
     Returns:
-        - list: Coefficients and powers for the radial polynomial.
+        - numpy.ndarray: Coefficients c_s, s = 0..(n - m)/2, of the powers RHO**(n - 2s),
+          i.e. ordered by descending power as needed by Horner's scheme. The array is
+          cached per (m, n) and read-only.
     """
-    coeff = []  # List to store coefficients
-    pow = []    # List to store corresponding powers
-
-    # Zernike radial polynomials exist only if (n - m) is even
-    if (n - m) % 2 == 0:
-        for kk in range(0, int((n - m) / 2 + 1)):
-            # Compute the coefficient for the current term using factorials
-            aa = ((-1) ** kk * math.factorial(int(n - kk))) / (
-                math.factorial(int(kk)) *
-                math.factorial(int((n + m) / 2 - kk)) *
-                math.factorial(int((n - m) / 2 - kk))
-            )
-            # Compute the corresponding power
-            bb = n - 2 * kk
-            coeff.append(aa)
-            pow.append(bb)
-    else:
-        # If (n - m) is not even, return zero for coefficients and powers
-        coeff.append(0)
-        pow.append(0)
+    # Zernike radial polynomials exist only if m <= n and (n - m) is even
+    if m > n or (n - m) % 2 != 0:
+        return np.zeros(1)  # The radial polynomial vanishes identically
+
+    K = (n - m) // 2
+    a = (n + m) // 2
+    coeff = np.empty(K + 1)  # Array to store the coefficients
 
-    return [coeff, pow]  # Return the coefficients and powers as a list
+    # c_0 = n! / (((n+m)/2)! ((n-m)/2)!), then the exact integer recurrence
+    # c_{k+1} = -c_k ((n+m)/2 - k)((n-m)/2 - k) / ((k+1)(n-k)) instead of four factorials per term
+    c = math.comb(n, K)
+    coeff[0] = c
+    for kk in range(K):
+        c = -c * (a - kk) * (K - kk) // ((kk + 1) * (n - kk))
+        coeff[kk + 1] = c
+
+    coeff.flags.writeable = False
+    return coeff
 
 
 def Zernike(RHO, PHI, m, n):
@@ -65,32 +108,184 @@ def Zernike(RHO, PHI, m, n):
         - numpy.ndarray: Normalized Zernike polynomial values within the aperture.
 
     """
-    ZR = np.zeros(RHO.shape)  # Initialize the Zernike radial polynomial
-    rn = RR(np.abs(m), n)     # Compute radial coefficients and powers
+    am = abs(m)  # The radial part only depends on |m|
 
-    # Evaluate the radial polynomial using the precomputed coefficients
-    for ii in range(len(rn[0])):
-        ZR = ZR + rn[0][ii] * RHO ** rn[1][ii]
+    if optics_nb is not None:
+        # Compiled radial kernel (coefficient recurrence + Horner in RHO^2)
+        RHO64 = np.asarray(RHO, dtype=np.float64)
+        ZR = optics_nb.zernike_radial_f64(am, n, RHO64.ravel()).reshape(RHO64.shape)
+    else:
+        coeffs = RR(am, n)     # Compute radial coefficients (descending powers)
+
+        # Horner's scheme in RHO^2: R = RHO^|m| (c_0 RHO^(n-m) + c_1 RHO^(n-m-2) + ... + c_K),
+        # one in-place multiply-add per term instead of a full-grid power per term
+        ZR = np.full(np.shape(RHO), coeffs[0], dtype=np.result_type(RHO, np.float32))
+        if len(coeffs) > 1:
+            RHO2 = RHO * RHO
+            for c in coeffs[1:]:
+                np.multiply(ZR, RHO2, out=ZR)
+                ZR += c
+        if am > 0:
+            ZR *= RHO ** am
 
     # Handle the azimuthal dependence (cosine or sine based on the sign of m)
     if m >= 0:
-        Z = ZR * np.cos(np.abs(m) * PHI)
+        Z = ZR * np.cos(am * PHI)
     else:
-        Z = ZR * np.sin(np.abs(m) * PHI)
+        Z = ZR * np.sin(am * PHI)
 
     # Mask the polynomial to be valid only inside the unit disk (RHO <= 1)
     M = (RHO <= 1)  # Boolean mask for the aperture
     P = Z * M       # Apply the mask to restrict Zernike values to the aperture
 
     # Normalize the polynomial to have a range of 0 to 1
-    P = (P - np.min(P)) / np.max(P - np.min(P))
+    return _normalize(P)
+
+
+def _normalize(P):
+    """
+    Maps P in place to the range 0 to 1 with its own minimum and maximum over the window.
+    The bounds depend on how much of the aperture the window covers (and R_n^m need not reach
+    -1), so they are not replaced by the analytic bound |Z| <= 1. Holograms cache the
+    normalized polynomial per window (see holograms._zernike_phase), so the two reductions
+    run once per window and mode.
+    """
+    P -= np.min(P)
+    P /= np.max(P)
     return P
 
 
+def Zernike_xy(X, Y, m, n):
+    """
+    Construct the Zernike polynomial directly from Cartesian coordinates.
+    
+    Same result as Zernike(*cart2pol(X, Y), m, n) without the square root and arctangent
+    passes: the radial polynomial is evaluated in RHO^2 = X^2 + Y^2 and the angular part
+    uses RHO^|m| cos(m PHI) = Re((X + iY)^|m|) and RHO^|m| sin(|m| PHI) = Im((X + iY)^|m|).
+    
+    Parameters:
+        - X, Y (2D arrays): Cartesian coordinates (normalized to 1 at the aperture boundary).
+          A broadcastable row and column are also accepted.
+        - m (int): Azimuthal index (can be negative for sine terms).
+        - n (int): Radial index.
+    Returns:
+        - numpy.ndarray: Normalized Zernike polynomial values within the aperture.
+
+    """
+    am = abs(m)
+    R2 = X * X + Y * Y  # RHO^2 on the full grid
+
+    # Radial polynomial without the RHO^|m| factor, by Horner's scheme in RHO^2
+    coeffs = RR(am, n)
+    Z = np.full(np.shape(R2), coeffs[0], dtype=np.result_type(R2, np.float32))
+    for c in coeffs[1:]:
+        np.multiply(Z, R2, out=Z)
+        Z += c
+
+    # RHO^|m| times the cosine (m >= 0) or sine (m < 0) of |m| PHI
+    if am > 0:
+        V = _cpow(X + 1j * Y, am)
+        Z *= V.real if m >= 0 else V.imag
+
+    # Mask the polynomial to be valid only inside the unit disk (RHO <= 1)
+    P = Z * (R2 <= 1)
+
+    # Normalize the polynomial to have a range of 0 to 1
+    return _normalize(P)
+
+
+def Zernike_batch(RHO, PHI, ms, ns, weights):
+    """
+    Weighted sum of several Zernike polynomials evaluated in a single sweep.
+    
+    Equivalent to summing w * Zernike(RHO, PHI, m, n) over the modes, but the powers of RHO
+    are built once by repeated multiplication and the radial parts of all the modes are
+    obtained with one matrix product instead of a Python loop per mode.
+    
+    Parameters:
+        - RHO (2D array): Radial distance (normalized to 1 for the aperture boundary).
+        - PHI (2D array): Azimuthal angle (polar coordinate).
+        - ms (sequence of int): Azimuthal indices of the modes.
+        - ns (sequence of int): Radial indices of the modes.
+        - weights (sequence of float): Coefficient applied to each mode.
+    Returns:
+        - numpy.ndarray: Weighted sum of the normalized Zernike polynomials.
+
+    """
+    ms = np.asarray(ms, dtype=int)
+    ns = np.asarray(ns, dtype=int)
+    weights = np.asarray(weights, dtype=float)
+    K = int(ns.max()) + 1  # Number of distinct powers of RHO
+
+    # Powers RHO**k for k = 0..max(n), built by repeated multiplication
+    rho_powers = np.empty((K,) + RHO.shape)
+    rho_powers[0] = 1
+    for k in range(1, K):
+        np.multiply(rho_powers[k - 1], RHO, out=rho_powers[k])
+
+    # Coefficient matrix: C[i, k] multiplies RHO**k in the radial polynomial of mode i
+    C = np.zeros((len(ms), K))
+    for i, (m, n) in enumerate(zip(ms, ns)):
+        coeffs = RR(abs(m), n)
+        C[i, n - 2 * np.arange(len(coeffs))] = coeffs
+
+    # Radial polynomials of all the modes with a single matrix product
+    ZR = (C @ rho_powers.reshape(K, -1)).reshape((len(ms),) + RHO.shape)
+
+    # Azimuthal dependence for all the modes: cosine for m >= 0, sine (shifted cosine) for m < 0
+    am = np.abs(ms).reshape((-1,) + (1,) * RHO.ndim)
+    shift = (np.pi / 2) * (ms < 0).reshape(am.shape)
+    Z = ZR * np.cos(am * PHI - shift)
+
+    # Mask every mode to the unit disk, then normalize each one with its own minimum and
+    # maximum like Zernike: w (P - min) / (max - min), summed over the modes as a single
+    # weighted sum of the masked polynomials plus a constant offset
+    Z *= (RHO <= 1)
+    axes = tuple(range(1, Z.ndim))
+    vmin = Z.min(axis=axes)
+    scale = weights / (Z.max(axis=axes) - vmin)
+    return np.tensordot(scale, Z, axes=1) - np.dot(scale, vmin)
+
+
 ################################################################################
 # Numerical Implementation of Special Functions
 ################################################################################
 
+if njit is not None:
+    @njit(parallel=True, nogil=True, fastmath=True, cache=True)
+    def _nlaguerre_jit(n, a, x):
+        # L_{k+1}^a(x) = ((2k + 1 + a - x)L_k^a(x) - (k + a)L_{k-1}^a(x)) / (k + 1), point by point
+        out = np.empty_like(x)
+        for i in prange(x.size):
+            xi = x[i]
+            l0 = 1.0
+            l1 = 1.0 + a - xi
+            if n == 0:
+                l1 = l0
+            for k in range(1, n):
+                l2 = ((2 * k + 1 + a - xi) * l1 - (k + a) * l0) / (k + 1)
+                l0 = l1
+                l1 = l2
+            out[i] = l1
+        return out
+
+    @njit(parallel=True, nogil=True, fastmath=True, cache=True)
+    def _nhermite_jit(n, x):
+        # H_k(x) = 2xH_{k-1}(x) - 2(k-1)H_{k-2}(x), point by point
+        out = np.empty_like(x)
+        for i in prange(x.size):
+            xi = x[i]
+            h0 = 1.0
+            h1 = 2.0 * xi
+            if n == 0:
+                h1 = h0
+            for k in range(2, n + 1):
+                h2 = 2.0 * xi * h1 - 2.0 * (k - 1) * h0
+                h0 = h1
+                h1 = h2
+            out[i] = h1
+        return out
+
 
 def NlaguerreL(n, a, X):
     """
@@ -104,21 +299,81 @@ def NlaguerreL(n, a, X):
         - numpy.ndarray: Values of the generalized Laguerre polynomial.
         
     """
-    LL = 0  # Initialize the result
-    # Iterate over each term in the polynomial expansion
-    for m in range(n + 1):
-        # Compute each term using the formula for Laguerre polynomials
-        term = (
-            ((-1) ** m) * math.factorial(n + a) /
-            (math.factorial(n - m) * math.factorial(a + m) * math.factorial(m)) *
-            (X ** m)
-        )
-        LL += term  # Accumulate the result
-    return LL
-
+    if optics_nb is not None and np.ndim(X) > 0:
+        X64 = np.asarray(X, dtype=np.float64)
+        return optics_nb.nlaguerre_f64(n, float(a), X64.ravel()).reshape(X64.shape)
+    if njit is not None and np.ndim(X) > 0:
+        Xf = np.asarray(X)
+        Xf = Xf.astype(np.result_type(Xf, np.float32), copy=False)  # Keep single precision grids
+        return _nlaguerre_jit(n, float(a), Xf.ravel()).reshape(Xf.shape)
+
+    # Three-term recurrence: L_0^a = 1, L_1^a = 1 + a - X,
+    # L_{k+1}^a = ((2k + 1 + a - X)L_k^a - (k + a)L_{k-1}^a) / (k + 1)
+    # Three buffers are reused in place and no factorials or powers of X are needed.
+    X = np.asarray(X)
+    X = X.astype(np.result_type(X, np.float32), copy=False)
+    Lm1 = np.ones_like(X)  # L_0^a(x)
+    if n == 0:
+        return Lm1
+    Lm = (1 + a) - X  # L_1^a(x)
+    tmp = np.empty_like(X)
+    for k in range(1, n):
+        np.subtract(2 * k + 1 + a, X, out=tmp)  # (2k + 1 + a - X)
+        tmp *= Lm
+        Lm1 *= (k + a)
+        tmp -= Lm1
+        tmp /= (k + 1)
+        Lm1, Lm, tmp = Lm, tmp, Lm1  # Rotate the buffers: L_{k-1} <- L_k, L_k <- L_{k+1}
+    return Lm
+
+
+
+def _cpow(z, k):
+    """
+    Raise a complex array to a non-negative integer power by binary exponentiation.
+    
+    Parameters:
+        - z (array-like): Complex base.
+        - k (int): Non-negative integer exponent.
+    
+    Returns:
+        - numpy.ndarray: z**k evaluated with about log2(k) complex multiplications.
+    """
+    result = np.ones_like(z)
+    base = z
+    while k > 0:
+        if k & 1:
+            result = result * base
+        k >>= 1
+        if k:
+            base = base * base
+    return result
+
+
+def phase_tower(max_ell, PHI):
+    """
+    Yield the azimuthal phase factors exp(1j*k*PHI) for k = 0, 1, ..., max_ell.
+    
+    Only one complex exponential is evaluated; every further order is obtained with the
+    recurrence E_{k+1} = E_k * E_1, i.e. one complex multiplication per step. Factors for
+    negative orders are the complex conjugates of the yielded ones.
+    
+    Parameters:
+        - max_ell (int): Highest azimuthal order to generate.
+        - PHI (2D array): Azimuthal angle (in radians).
+    
+    Yields:
+        - numpy.ndarray: exp(1j*k*PHI), in increasing order of k.
+    """
+    E1 = np.exp(1j * PHI)
+    E = np.ones_like(E1)
+    yield E
+    for _ in range(max_ell):
+        E = E * E1
+        yield E
 
 
-def LG(RHO, PHI, ell, p, w0):
+def LG(RHO, PHI, ell, p, w0, X=None, Y=None, dtype=np.complex64):
     """
     Generate a Laguerre-Gaussian beam.
     
@@ -128,22 +383,59 @@ def LG(RHO, PHI, ell, p, w0):
         - ell (int): Azimuthal index (orbital angular momentum quantum number).
         - p (int): Radial index.
         - w0 (float): Beam waist (radius at which the beam's intensity drops to 1/e^2).
+        - X, Y (2D arrays, optional): Cartesian coordinates of the same grid. When given,
+          the vortex term is computed as ((X + i*sign(ell)*Y) * sqrt(2)/w0)**|ell|,
+          which replaces the float power of RHO and the complex exponential of PHI.
+        - dtype (numpy dtype): Complex dtype of the field. The default single precision
+          halves the memory traffic and is well below the 8-bit resolution of the SLM.
     
     Returns:
         - numpy.ndarray: Complex field of the Laguerre-Gaussian beam.
     """
+    # Work on the grids in the real precision that matches the requested complex dtype
+    real_dtype = np.finfo(dtype).dtype
+    RHO = np.asarray(RHO, dtype=real_dtype)
+    PHI = np.asarray(PHI, dtype=real_dtype)
+
+    # Scalars used on the whole grid (plain Python floats keep the grid precision)
+    aell = abs(ell)
+    inv_w0 = 1.0 / w0
+    sqrt2_over_w0 = math.sqrt(2) * inv_w0
+
     # Normalization constant for the Laguerre-Gaussian mode
-    C = np.sqrt((2 * math.factorial(p)) / (np.pi * math.factorial(p + np.abs(ell)))) * (1 / w0)
-    
+    C = math.sqrt((2 * math.factorial(p)) / (math.pi * math.factorial(p + aell))) * inv_w0
+
+    # (r/w0)^2, shared by the Gaussian envelope and the Laguerre argument
+    U = (RHO * inv_w0) ** 2
+    L = NlaguerreL(p, aell, 2 * U)  # Laguerre polynomial
+
+    # Radial dependence and azimuthal phase factor: r^|l| exp(i l phi) = (x + i sign(l) y)^|l|
+    if X is not None and Y is not None:
+        X = np.asarray(X, dtype=real_dtype)
+        Y = np.asarray(Y, dtype=real_dtype)
+        vortex = _cpow((X + (1j if ell >= 0 else -1j) * Y) * sqrt2_over_w0, aell)
+    elif ne is not None:
+        # Envelope, vortex and Laguerre factor fused in one pass, without complex temporaries
+        field = ne.evaluate(
+            "C * exp(-U) * (s * RHO) ** aell * exp(1j * ell * PHI) * L",
+            local_dict={'C': C, 'U': U, 's': sqrt2_over_w0, 'RHO': RHO, 'aell': aell,
+                        'ell': ell, 'PHI': PHI, 'L': L})
+        return field.astype(dtype, copy=False)
+    else:
+        vortex = (sqrt2_over_w0 * RHO) ** aell * np.exp(1j * ell * PHI)
+
     # Compute the Laguerre-Gaussian field
-    field = (
-        C *
-        np.exp(-(RHO / w0) ** 2) *  # Radial Gaussian envelope
-        (np.sqrt(2) * RHO / w0) ** np.abs(ell) *  # Radial dependence
-        np.exp(1j * ell * PHI) *  # Azimuthal phase factor
-        NlaguerreL(p, np.abs(ell), 2 * (RHO / w0) ** 2)  # Laguerre polynomial
-    )
-    return field
+    if ne is not None:
+        field = ne.evaluate("C * exp(-U) * vortex * L",
+                            local_dict={'C': C, 'U': U, 'vortex': vortex, 'L': L})
+    else:
+        field = (
+            C *
+            np.exp(-U) *  # Radial Gaussian envelope
+            vortex *  # Radial dependence and azimuthal phase factor
+            L  # Laguerre polynomial
+        )
+    return field.astype(dtype, copy=False)
 
 
 
@@ -159,6 +451,14 @@ def NHermite(n, X):
         - numpy.ndarray: Values of the Hermite polynomial.
 
     """
+    if optics_nb is not None and n >= 0:
+        X64 = np.asarray(X, dtype=np.float64)
+        return optics_nb.nhermite_f64(n, X64.ravel()).reshape(X64.shape)
+    if njit is not None and n >= 0 and np.ndim(X) > 0:
+        Xf = np.asarray(X)
+        Xf = Xf.astype(np.result_type(Xf, np.float32), copy=False)  # Keep single precision grids
+        return _nhermite_jit(n, Xf.ravel()).reshape(Xf.shape)
+
     # Initialize the first two Hermite polynomials
     Hn1 = np.ones(X.shape)  # H_0(x) = 1
     H = 2 * X  # H_1(x) = 2x
@@ -177,32 +477,78 @@ def NHermite(n, X):
             H = Hn  # Update H_{n-1} to H_n
     return H
 
-def HG(X, Y, m, n, w0):
+def hermite_tower(max_n, X):
+    """
+    Yield the Hermite polynomials H_0(X), H_1(X), ..., H_max_n(X) in a single pass.
+    
+    Uses the same recurrence as NHermite but keeps only the last two orders alive, so a
+    caller that needs every order up to max_n pays O(max_n) array operations instead of
+    O(max_n^2) from calling NHermite once per order.
+    
+    Parameters:
+        - max_n (int): Highest order to generate.
+        - X (array-like): Input values for the polynomials.
+    
+    Yields:
+        - numpy.ndarray: H_k(X), in increasing order of k.
+    """
+    if max_n < 0:
+        raise ValueError("The index must be 0 or positive.")
+
+    Hn1 = np.ones(np.shape(X))  # H_0(x) = 1
+    yield Hn1
+    if max_n == 0:
+        return
+    H = 2 * X  # H_1(x) = 2x
+    yield H
+    for nn in range(2, max_n + 1):
+        Hn = 2 * X * H - 2 * (nn - 1) * Hn1  # H_n(x) = 2xH_{n-1}(x) - 2(n-1)H_{n-2}(x)
+        Hn1 = H
+        H = Hn
+        yield H
+
+
+def HG(X, Y, m, n, w0, dtype=np.complex64):
     """
     # Generate a Hermite-Gaussian beam.
     
     Parameters:
-        - X, Y (2D arrays): Cartesian coordinates.
+        - X, Y (2D arrays): Cartesian coordinates. A row (1, Nx) and a column (Ny, 1), as
+          given by np.meshgrid(..., sparse=True), also work and avoid full coordinate grids.
         - m, n (int): Orders of the Hermite polynomial along x and y, respectively.
         - w0 (float): Beam waist (radius at which the beam's intensity drops to 1/e^2).
+        - dtype (numpy dtype): Complex dtype of the field (single precision by default).
     
     Returns:
         - numpy.ndarray: Complex field of the Hermite-Gaussian beam.
     """
+    # Work on the grids in the real precision that matches the requested complex dtype
+    real_dtype = np.finfo(dtype).dtype
+    X = np.asarray(X, dtype=real_dtype)
+    Y = np.asarray(Y, dtype=real_dtype)
+
+    # Full meshgrids are constant along one axis, so the separable factors below only need
+    # the first row of X and the first column of Y (Xd + Yd points instead of Xd * Yd)
+    if X.shape[0] > 1 and (X == X[:1]).all():
+        X = X[:1]
+    if Y.shape[1] > 1 and (Y == Y[:, :1]).all():
+        Y = Y[:, :1]
+
     # Compute the spacing between grid points
     h = np.abs(X[0, 0] - X[0, 1])
 
-    # Calculate the Hermite-Gaussian field
+    # Calculate the Hermite-Gaussian field. The mode is separable, so each factor is built on
+    # the x and y grids alone and they are combined by broadcasting in a single product
+    s = math.sqrt(2) / w0
     field = (
-        NHermite(m, np.sqrt(2) * X / w0) *  # Hermite polynomial in X
-        NHermite(n, np.sqrt(2) * Y / w0) *  # Hermite polynomial in Y
-        np.exp(-(X ** 2 + Y ** 2) / w0 ** 2)  # Gaussian envelope
+        (NHermite(m, s * X) * np.exp(-X ** 2 / w0 ** 2)) *  # Hermite-Gaussian factor in X
+        (NHermite(n, s * Y) * np.exp(-Y ** 2 / w0 ** 2))  # Hermite-Gaussian factor in Y
     )
     
     # Normalize the field to ensure unit power
     normalization = np.sum(h * h * np.abs(field) ** 2)
     field = field / np.sqrt(normalization)
-    return field
+    return field.astype(dtype, copy=False)
 
 ################################################################################
 # Propagation and Utility Functions
@@ -228,43 +574,115 @@ def HG(X, Y, m, n, w0):
 # z       - Propagation distance
 # u2      - Complex Amplitude of the beam at the observation plane
 
-def propTF(u1,Lx,Ly,la,z):
+@lru_cache(maxsize=8)
+def _F2(shape, Lx, Ly, real_dtype, half):
+    """
+    Squared spatial frequency fx^2 + fy^2 in FFT order, cached per window (read-only).
+    """
+    # Determine the shape of the input field
+    Yd, Xd = shape
+    
+    # Calculate sampling intervals
+    dx = Lx / Xd
+    dy = Ly / Yd
+
+    # Define frequency grids for x and y directions in FFT order (no fftshift needed)
+    if half:
+        fx = np.fft.rfftfreq(Xd, d=dx).astype(real_dtype)  # Only the non-negative x frequencies
+    else:
+        fx = np.fft.fftfreq(Xd, d=dx).astype(real_dtype)
+    fy = np.fft.fftfreq(Yd, d=dy).astype(real_dtype)
+
+    # Squared spatial frequency by broadcasting the 1D grids (no 2D meshgrid temporaries)
+    F2 = fx[None, :] ** 2 + fy[:, None] ** 2
+    F2.flags.writeable = False
+    return F2
+
+
+def TF(shape, Lx, Ly, la, z, dtype=np.complex64, half=False):
+    """
+    Fresnel transfer function used by propTF, in FFT order (no fftshift needed).
+
+    Parameters:
+        - shape (tuple): Shape (Yd, Xd) of the field to propagate.
+        - Lx, Ly (float): Side lengths of the simulation window in x and y directions.
+        - la (float): Wavelength of the light.
+        - z (float): Propagation distance.
+        - dtype (numpy dtype): Complex dtype of the transfer function.
+        - half (bool): Only the non-negative x frequencies, for the rfft2 path of real fields.
+
+    Returns:
+        - numpy.ndarray: Transfer function in the frequency domain.
+    """
+    real_dtype = np.finfo(dtype).dtype
+
+    # The frequency grid only depends on the window, so it is reused between propagations
+    F2 = _F2(tuple(shape), Lx, Ly, real_dtype, half)
+
+    # Compute the transfer function for Fresnel propagation
+    if ne is not None:
+        H = ne.evaluate("exp(-1j * k * F2)", local_dict={'k': np.pi * 0.25 * la * z, 'F2': F2})
+    else:
+        H = np.exp(-1j * np.pi * 0.25 * la * z * F2)
+    return H.astype(dtype, copy=False)
+
+
+def propTF(u1,Lx,Ly,la,z,dtype=np.complex64,H=None):
     """
     Perform Fresnel propagation using the transfer function approach. 
     Based on Computational Fourier Optics by Voelz
     Generalization to non-square windows
 
     Parameters:
-        - u1 (2D array): Complex amplitude of the beam at the source plane.
+        - u1 (2D array): Complex amplitude of the beam at the source plane. Real-valued
+          fields are transformed with rfft2, which only computes half of the spectrum.
         - Lx, Ly (float): Side lengths of the simulation window in x and y directions.
         - la (float): Wavelength of the light.
         - z (float): Propagation distance.
+        - dtype (numpy dtype): Complex dtype used for the FFTs and the transfer function.
+          Single precision (default) halves the bandwidth of every pass over the grid.
+        - H (2D array, optional): Transfer function from TF with the same parameters, to
+          reuse it across repeated propagations instead of rebuilding it on every call.
+
+    When CuPy and a GPU are available (and H is not given) the FFTs run on the device
+    through optics_gpu.propTF_gpu, which caches the transfer function there.
         
     Returns:
         - numpy.ndarray: Complex amplitude of the beam at the observation plane.
     
     """
+    if optics_gpu is not None and H is None:
+        return cp.asnumpy(optics_gpu.propTF_gpu(u1, Lx, Ly, la, z, dtype))
+
+    # Real input fields (e.g. LG/HG before phase modulation) take the half-spectrum path
+    real_input = not np.iscomplexobj(u1)
+
+    # Cast the input field to the working precision (no copy if it already matches)
+    u1 = u1.astype(np.finfo(dtype).dtype if real_input else dtype, copy=False)
+
     # Determine the shape of the input field
     Yd, Xd = u1.shape
-    
-    # Calculate sampling intervals
-    dx = Lx / Xd
-    dy = Ly / Yd
-
-    # Define frequency grids for x and y directions
-    fx = np.arange(-1 / (2 * dx), 1 / (2 * dx), 1 / Lx)
-    fy = np.arange(-1 / (2 * dy), 1 / (2 * dy), 1 / Ly)
-    Fx, Fy = np.meshgrid(fx, fy)  # Create 2D frequency grids
 
     # Compute the transfer function for Fresnel propagation
-    H = np.exp(-1j * np.pi * 0.25 * la * z * (Fx**2 + Fy**2))
+    if H is None:
+        H = TF((Yd, Xd), Lx, Ly, la, z, dtype, half=real_input)
+
+    if real_input:
+        # H is complex, so H*U1 is not Hermitian and cannot be inverted with irfft2 directly.
+        # Both Re(H) and Im(H) are even in (fx, fy), so each one maps a real field to a real field:
+        # u2 = irfft2(Re(H) U1) + i irfft2(Im(H) U1), with U1 the half spectrum of u1.
+        U1 = _fft.rfft2(u1, **_fft_kwargs)
+        u2 = np.empty((Yd, Xd), dtype=dtype)
+        u2.real = _fft.irfft2(H.real * U1, s=(Yd, Xd), **_fft_kwargs)
+        u2.imag = _fft.irfft2(H.imag * U1, s=(Yd, Xd), **_fft_kwargs)
+        return u2
 
     # Perform Fourier transform of the input field
-    U1 = np.fft.fftshift(np.fft.fft2(u1))
+    U1 = _fft.fft2(u1, **_fft_kwargs)
 
     # Apply the transfer function in the frequency domain
     U2 = H * U1
 
     # Transform back to the spatial domain
-    u2 = np.fft.ifft2(np.fft.ifftshift(U2))
-    return u2
\ No newline at end of file
+    u2 = _fft.ifft2(U2, **_fft_kwargs)
+    return u2.astype(dtype, copy=False)
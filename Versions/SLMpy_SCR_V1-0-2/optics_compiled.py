@@ -0,0 +1,103 @@
+"""
+Ahead-of-time compiled kernels for the special functions in optics.py.
+
+Running this script once builds the `optics_nb` extension module next to it:
+
+    python optics_compiled.py
+
+optics.py imports `optics_nb` when it is available and falls back to the NumPy
+implementations otherwise. Numba is only needed to build the extension, not to use it,
+so there is no JIT warm-up or compile cost when the GUI redraws a hologram.
+"""
+
+import os
+import numpy as np
+from numba.pycc import CC
+
+cc = CC('optics_nb')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@cc.export('nhermite_f64', 'f8[:](i4, f8[:])')
+def nhermite_f64(n, x):
+    """
+    Hermite polynomial H_n(x) evaluated with the three-term recurrence, one point at a time.
+    """
+    out = np.empty_like(x)
+    for i in range(x.size):
+        xi = x[i]
+        h0 = 1.0  # H_0(x) = 1
+        h1 = 2.0 * xi  # H_1(x) = 2x
+        if n == 0:
+            out[i] = h0
+            continue
+        for k in range(2, n + 1):
+            h2 = 2.0 * xi * h1 - 2.0 * (k - 1) * h0  # H_k(x) = 2xH_{k-1}(x) - 2(k-1)H_{k-2}(x)
+            h0 = h1
+            h1 = h2
+        out[i] = h1
+    return out
+
+
+@cc.export('nlaguerre_f64', 'f8[:](i4, f8, f8[:])')
+def nlaguerre_f64(n, a, x):
+    """
+    Generalized Laguerre polynomial L_n^a(x) evaluated with the three-term recurrence.
+    """
+    out = np.empty_like(x)
+    for i in range(x.size):
+        xi = x[i]
+        l0 = 1.0  # L_0^a(x) = 1
+        l1 = 1.0 + a - xi  # L_1^a(x) = 1 + a - x
+        if n == 0:
+            out[i] = l0
+            continue
+        for k in range(1, n):
+            # L_{k+1}^a(x) = ((2k + 1 + a - x)L_k^a(x) - (k + a)L_{k-1}^a(x)) / (k + 1)
+            l2 = ((2 * k + 1 + a - xi) * l1 - (k + a) * l0) / (k + 1)
+            l0 = l1
+            l1 = l2
+        out[i] = l1
+    return out
+
+
+@cc.export('zernike_radial_f64', 'f8[:](i4, i4, f8[:])')
+def zernike_radial_f64(m, n, rho):
+    """
+    Zernike radial polynomial R_n^m(rho) for m >= 0.
+
+    The coefficients are generated with the recurrence
+    c_{s+1} = -c_s ((n+m)/2 - s)((n-m)/2 - s) / ((s+1)(n-s)), starting from
+    c_0 = n! / (((n+m)/2)! ((n-m)/2)!), and the polynomial is evaluated with
+    Horner's scheme in rho^2.
+    """
+    out = np.zeros_like(rho)
+    if m > n or (n - m) % 2 != 0:
+        return out  # Radial polynomials exist only if m <= n and (n - m) is even
+
+    K = (n - m) // 2
+    coeffs = np.empty(K + 1)
+    c = 1.0
+    for j in range(1, n + 1):
+        c *= j
+    for j in range(1, (n + m) // 2 + 1):
+        c /= j
+    for j in range(1, K + 1):
+        c /= j
+    coeffs[0] = c
+    for s in range(K):
+        c = -c * ((n + m) // 2 - s) * (K - s) / ((s + 1) * (n - s))
+        coeffs[s + 1] = c
+
+    for i in range(rho.size):
+        r = rho[i]
+        r2 = r * r
+        acc = coeffs[0]
+        for s in range(1, K + 1):
+            acc = acc * r2 + coeffs[s]
+        out[i] = acc * r ** m
+    return out
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,153 @@
+"""
+CUDA versions of the propagation and beam functions in optics.py, built on CuPy.
+
+The functions take and return CuPy arrays, so fields can stay on the GPU across the
+iterations of a phase retrieval loop. Only move the result back with cp.asnumpy(...)
+when it is needed on the host (e.g. to display it on the SLM).
+
+Requires CuPy (https://cupy.dev) and a CUDA capable GPU.
+"""
+
+import math
+from collections import OrderedDict
+import cupy as cp
+import cupyx.scipy.fft as cufft
+
+# Transfer functions kept on the device, keyed by grid and propagation parameters.
+# Least recently used entries are evicted beyond _H_CACHE_SIZE to bound device memory
+_H_CACHE_SIZE = 8
+_H_cache = OrderedDict()
+
+
+def _transfer_function(shape, Lx, Ly, la, z, dtype):
+    """
+    Fresnel transfer function in FFT order, computed once per set of parameters.
+    """
+    key = (shape, Lx, Ly, la, z, cp.dtype(dtype).str)
+    H = _H_cache.get(key)
+    if H is not None:
+        _H_cache.move_to_end(key)
+    else:
+        Yd, Xd = shape
+        real_dtype = cp.finfo(dtype).dtype
+        fx = cp.fft.fftfreq(Xd, d=Lx / Xd).astype(real_dtype)
+        fy = cp.fft.fftfreq(Yd, d=Ly / Yd).astype(real_dtype)
+        F2 = fx[None, :] ** 2 + fy[:, None] ** 2
+        H = cp.exp(-1j * math.pi * 0.25 * la * z * F2).astype(dtype, copy=False)
+        _H_cache[key] = H
+        if len(_H_cache) > _H_CACHE_SIZE:
+            _H_cache.popitem(last=False)
+    return H
+
+
+def clear_cache():
+    """
+    Release the transfer functions cached on the device.
+    """
+    _H_cache.clear()
+
+
+def propTF_gpu(u1, Lx, Ly, la, z, dtype=cp.complex64):
+    """
+    Perform Fresnel propagation on the GPU using the transfer function approach.
+    Same as optics.propTF, with the transfer function cached on the device.
+
+    Parameters:
+        - u1 (2D cupy array): Complex amplitude of the beam at the source plane.
+          NumPy arrays are copied to the device.
+        - Lx, Ly (float): Side lengths of the simulation window in x and y directions.
+        - la (float): Wavelength of the light.
+        - z (float): Propagation distance.
+        - dtype (cupy dtype): Complex dtype used for the FFTs and the transfer function.
+
+    Returns:
+        - cupy.ndarray: Complex amplitude of the beam at the observation plane.
+    """
+    u1 = cp.asarray(u1, dtype=dtype)
+    H = _transfer_function(u1.shape, Lx, Ly, la, z, dtype)
+
+    # Forward FFT, transfer function and inverse FFT, all on the device
+    U2 = cufft.fft2(u1)
+    U2 *= H
+    return cufft.ifft2(U2, overwrite_x=True)
+
+
+def _nlaguerre(n, a, X):
+    """
+    Generalized Laguerre polynomial L_n^a(X) from the three-term recurrence.
+    """
+    L0 = cp.ones_like(X)
+    if n == 0:
+        return L0
+    L1 = 1 + a - X
+    for k in range(1, n):
+        L0, L1 = L1, ((2 * k + 1 + a - X) * L1 - (k + a) * L0) / (k + 1)
+    return L1
+
+
+def _nhermite(n, X):
+    """
+    Hermite polynomial H_n(X) from the three-term recurrence.
+    """
+    H0 = cp.ones_like(X)
+    if n == 0:
+        return H0
+    H1 = 2 * X
+    for k in range(2, n + 1):
+        H0, H1 = H1, 2 * X * H1 - 2 * (k - 1) * H0
+    return H1
+
+
+def LG_gpu(X, Y, ell, p, w0, dtype=cp.complex64):
+    """
+    Laguerre-Gaussian beam evaluated on the GPU.
+
+    Parameters:
+        - X, Y (2D cupy arrays): Cartesian coordinates.
+        - ell (int): Azimuthal index.
+        - p (int): Radial index.
+        - w0 (float): Beam waist.
+        - dtype (cupy dtype): Complex dtype of the result.
+
+    Returns:
+        - cupy.ndarray: Complex field of the Laguerre-Gaussian beam.
+    """
+    real_dtype = cp.finfo(dtype).dtype
+    X = cp.asarray(X, dtype=real_dtype)
+    Y = cp.asarray(Y, dtype=real_dtype)
+
+    aell = abs(ell)
+    C = math.sqrt((2 * math.factorial(p)) / (math.pi * math.factorial(p + aell))) / w0
+
+    # r^|l| exp(i l phi) = (x + i sign(l) y)^|l|, without arctan2
+    vortex = ((X + (1j if ell >= 0 else -1j) * Y) * (math.sqrt(2) / w0)) ** aell
+
+    U = (X ** 2 + Y ** 2) / w0 ** 2
+    field = C * cp.exp(-U) * vortex * _nlaguerre(p, aell, 2 * U)
+    return field.astype(dtype, copy=False)
+
+
+def HG_gpu(X, Y, m, n, w0, dtype=cp.complex64):
+    """
+    Hermite-Gaussian beam evaluated on the GPU, normalized like optics.HG.
+
+    Parameters:
+        - X, Y (2D cupy arrays): Cartesian coordinates.
+        - m, n (int): Mode indices in x and y directions.
+        - w0 (float): Beam waist.
+        - dtype (cupy dtype): Complex dtype of the result.
+
+    Returns:
+        - cupy.ndarray: Complex field of the Hermite-Gaussian beam.
+    """
+    real_dtype = cp.finfo(dtype).dtype
+    X = cp.asarray(X, dtype=real_dtype)
+    Y = cp.asarray(Y, dtype=real_dtype)
+
+    h = abs(float(X[0, 0] - X[0, 1]))
+    s = math.sqrt(2) / w0
+    field = _nhermite(m, s * X) * _nhermite(n, s * Y) * cp.exp(-(X ** 2 + Y ** 2) / w0 ** 2)
+
+    # Normalization on the device; only the scalar crosses back to the host
+    field = field / cp.sqrt(cp.sum(h * h * cp.abs(field) ** 2))
+    return field.astype(dtype, copy=False)
@@ -1,13 +1,24 @@
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from PyQt5.QtWidgets import QMainWindow, QApplication
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
-import os
+from pathlib import Path
 from matplotlib.colors import LinearSegmentedColormap
 
-# Ensure QApplication is created before any GUI elements
-app = QApplication.instance() or QApplication([])
+_app = None  # Reference that keeps the QApplication alive once it has been created
+
+
+def get_app():
+    """
+    Returns the running QApplication, creating it on first use. Qt is only started when a
+    screen is actually needed, so importing this module (e.g. in batch jobs) stays cheap.
+    """
+    global _app
+    if _app is None:
+        _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
 
 class SLM(QMainWindow):
     def __init__(self, screen_index=0, hologram=None, Cmap='gray'):
@@ -18,6 +29,7 @@ class SLM(QMainWindow):
             - screen_index (int): The index of the screen.
             - hologram (numpy.ndarray): The precomputed hologram to display.
         """
+        get_app()  # QApplication must exist before any GUI elements
         super().__init__()
 
         self.screen_index = screen_index
@@ -36,6 +48,7 @@ class SLM(QMainWindow):
         self.figure.subplots_adjust(left=0, right=1, top=1, bottom=0)
         self.ax.set_axis_off()
         self.canvas = FigureCanvas(self.figure)
+        self.image = None  # AxesImage reused between updates
 
         # Configure PyQt window
         self.setCentralWidget(self.canvas)
@@ -51,18 +64,51 @@ class SLM(QMainWindow):
         """Displays the given hologram pattern on the screen."""
         scale_x = self.resolution[1] / array.shape[0]
         scale_y = self.resolution[0] / array.shape[1]
-        resized_array = np.kron(array, np.ones((int(scale_x), int(scale_y))))  # Resize array
-
-        self.ax.clear()
-        self.ax.imshow(resized_array, cmap=self.cmap, aspect="auto")
-        self.ax.set_axis_off()
-        self.canvas.draw()
+        sx, sy = int(scale_x), int(scale_y)
+
+        # Always rebuilt from the current contents: the caller may refill the same buffer
+        # (e.g. Hologram(..., out=buf)) and display it again
+        levels = to_levels(array)
+        H, W = levels.shape
+        # Nearest-neighbour upscaling: each pixel repeated sx x sy times in one strided copy
+        resized_array = np.broadcast_to(levels[:, None, :, None], (H, sx, W, sy)).reshape(H * sx, W * sy)
+
+        if self.image is None or self.image.get_array().shape != resized_array.shape:
+            # First frame (or a new size): build the image once
+            self.ax.clear()
+            # Fixed 8-bit range: level k always maps to the same colormap entry. Any remaining
+            # (non-integer) scaling to the canvas is nearest neighbour too, never a smoothing filter
+            self.image = self.ax.imshow(resized_array, cmap=self.cmap, aspect="auto", vmin=0, vmax=255,
+                                        interpolation="nearest")
+            self.ax.set_axis_off()
+        else:
+            # Same artist, new pixels
+            self.image.set_data(resized_array)
+        self.canvas.draw_idle()
 
     def update(self, new_hologram):
         """Updates the screen with a new hologram."""
         self.display(new_hologram)
 
 
+def to_levels(array):
+    """
+    Converts a phase hologram in [0, 2 pi) to the 8-bit levels shown on the SLM.
+    uint8 arrays are assumed to hold levels already and are returned unchanged.
+
+    Parameters:
+        - array (numpy.ndarray): Hologram phase in radians, or 8-bit levels.
+
+    Returns:
+        - numpy.ndarray: uint8 array, 0 for a phase of 0 and 255 just below 2 pi.
+    """
+    if array.dtype == np.uint8:
+        return array
+    levels = np.multiply(array, np.float32(256 / (2 * np.pi)), dtype=np.float32)
+    np.clip(levels, 0, 255, out=levels)
+    return levels.astype(np.uint8)
+
+
 # ========
 # Getting the information of the screens available
 # ========
@@ -74,7 +120,7 @@ def get_screen_info():
     Returns:
         - A list containing screen index, resolution, and name.
     """
-    app = QApplication.instance() or QApplication([])  # Ensure QApplication exists
+    get_app()  # Ensure QApplication exists
     screen_list = QApplication.screens()
 
     return [(screen.geometry().width(), screen.geometry().height())
@@ -87,24 +133,40 @@ def get_screen_info():
 # Loading colormaps
 #====
 
+def _read_cmap(cmap_path):
+    """
+    Reads the RGB table of a .cmap file.
+
+    The parsed table is kept in a binary .npy file next to it, which is read instead of the
+    text file on later runs, as long as it is newer than the .cmap file.
+    """
+    cache_path = cmap_path.with_suffix(".npy")
+    if cache_path.exists() and cache_path.stat().st_mtime >= cmap_path.stat().st_mtime:
+        return np.load(cache_path)
+
+    cmap_data = np.loadtxt(cmap_path, dtype=np.float32)
+    try:
+        np.save(cache_path, cmap_data)
+    except OSError:
+        pass  # Read-only install: parse the text file every time
+    return cmap_data
+
+
 def load_colormaps():
     """Loads colormaps from the Cmaps directory and returns a dictionary."""
     
-    script_dir = os.path.dirname(os.path.abspath(__file__))  # Ensures saving in the same folder as the script
-    subfolder_path = os.path.join(script_dir, "Cmaps")
+    subfolder_path = Path(__file__).resolve().parent / "Cmaps"  # Cmaps folder next to the script
     
-    if not os.path.exists(subfolder_path):
+    if not subfolder_path.is_dir():
         #
         return {"gray": plt.get_cmap("gray")}  # Default to gray if folder is missing
 
-    cmap_files = [f for f in os.listdir(subfolder_path) if f.endswith(".cmap")]
     Cmap_Dict = {}
 
-    for cmap_file in cmap_files:
-        cmap_name = os.path.splitext(cmap_file)[0]
-        cmap_path = os.path.join(subfolder_path, cmap_file)
+    for cmap_path in subfolder_path.glob("*.cmap"):
+        cmap_name = cmap_path.stem
         try:
-            cmap_data = np.loadtxt(cmap_path)
+            cmap_data = _read_cmap(cmap_path)
             Cmap_Dict[cmap_name] = LinearSegmentedColormap.from_list(cmap_name, cmap_data)
         except Exception as e:
             print(f"[ERROR] Failed to load colormap {cmap_name}: {e}")
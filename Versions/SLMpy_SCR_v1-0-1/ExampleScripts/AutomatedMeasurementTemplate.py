@@ -3,11 +3,11 @@ Example Python Script for SLM Hologram Display and Measurement Automation
 
 This script demonstrates how to use a Spatial Light Modulator (SLM) to display Hermite-Gaussian (HG) holograms 
 and simultaneously run a separate measurement process using a motor. The script is designed to integrate with
-PyQt5 for GUI handling and supports multi-threading to ensure smooth operation without blocking the UI.
+PyQt5 for GUI handling: the measurement steps are scheduled on the Qt event loop, so they never block the UI.
 
 Features:
 - Generates and displays an HG hologram using a custom SLM screen manager.
-- Runs a motor control simulation in a separate thread to mimic a real-time measurement setup.
+- Runs a motor control simulation from Qt timers to mimic a real-time measurement setup.
 - Uses PyQt5 for GUI event loop management.
 - Ensures modularity and expandability for research applications in optics and physics.
 
@@ -23,9 +23,8 @@ License: GNU 3.0
 
 import sys
 import numpy as np
-import time
-import threading
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
 from slm import ScreenManager
 from holograms import HoloHG  # Import hologram function
 from pylablib.devices import Thorlabs
@@ -34,17 +33,20 @@ from pylablib.devices import Thorlabs
 # Measurement Setup
 # ==========================
 
-def measurement_step():
+def measurement_step(ii=0, steps=10):
     """
-    Simulates a measurement process by running a motor in a separate thread.
-    This function introduces a delay and then runs the motor loop for 10 iterations.
-    Each iteration prints a message and waits for 1 second.
+    Simulates a measurement process by running a motor for 10 iterations, one per second.
+    Each call performs one iteration and schedules the next one on the Qt event loop, so the
+    GUI stays responsive without a separate thread, and each step may safely update the SLM
+    (e.g. screen_manager.update_screen).
+
+    A blocking device call (such as a real Thorlabs motor move) should instead run in a
+    worker QThread and report back through a pyqtSignal; Qt GUI calls must stay in this thread.
     """
-    time.sleep(10)  # Initial delay before the measurement starts (simulating setup time)
-    
-    for ii in range(10):  # Loop to simulate motor running for 10 seconds
-        print("Motor is running")  # Print status update
-        time.sleep(1)  # Introduce a delay of 1 second per iteration
+    if ii >= steps:
+        return
+    print("Motor is running")  # Print status update
+    QTimer.singleShot(1000, lambda: measurement_step(ii + 1, steps))  # Next iteration in 1 second
 
 # ==========================
 # SLM Hologram Setup
@@ -68,25 +70,18 @@ screen_index = 2 if 2 in resolutions else 1  # Ensures compatibility if screen 2
 # - w0=0.5: Beam waist size
 # - LA=0.001: Scale parameter related to the beam
 # - SLM_Pix: Uses the resolution of the selected screen
-hg_hologram = HoloHG(m=3, n=2, w0=0.5, LA=0.001, SLM_Pix=resolutions[screen_index])
-
-# Add the generated hologram to the selected screen using the screen manager
-screen_manager.add_screen(screen_index, hg_hologram)
+# The hologram is computed in a worker thread and shown as soon as it is ready; the screen is
+# added right away (black until then), so the GUI does not wait for the computation.
+screen_manager.add_screen(screen_index)
+screen_manager.compute_screen(screen_index, HoloHG, m=3, n=2, w0=0.5, LA=0.001, SLM_Pix=resolutions[screen_index])
 
 # ==========================
 # Running the Complete Measurement
 # ==========================
 
-# Create a new thread for the motor control to prevent blocking the GUI
-# However, the function name `run_motor` is not defined in this script; it should be `measurement_step`.
-t1 = threading.Thread(target=measurement_step, name='t1')  # Runs the motor function in a separate thread
+# Start the motor steps after an initial delay of 10 seconds (simulating setup time)
+QTimer.singleShot(10000, measurement_step)
 
-# Start the measurement thread (motor operation)
-t1.start()
-
-# Execute the PyQt5 event loop in the main thread to ensure GUI responsiveness
+# Execute the PyQt5 event loop in the main thread; it also drives the measurement steps
 app.exec_()
 
-# Wait for the measurement thread to complete before exiting the script
-t1.join()
-
@@ -22,7 +22,7 @@ License: GNU 3.0
 import sys
 import numpy as np
 from PyQt5.QtWidgets import QApplication
-from slm import ScreenManager
+from slm import ScreenManager, HologramTask
 from holograms import HoloHG, HoloLG  # Import hologram functions
 from PyQt5.QtCore import QTimer
 
@@ -44,13 +44,22 @@ screen_manager = ScreenManager()
 # Retrieve available screen resolutions (using screen index as a key)
 resolutions = screen_manager.get_screen_resolutions()
 
-# Compute holograms manually with predefined parameters
-hg_hologram = HoloHG(m=3, n=2, w0=0.5, LA=0.001, SLM_Pix=resolutions[1])  # HG Mode
-lg_hologram = HoloLG(l=2, p=1, w0=0.6, LA=0.0015, SLM_Pix=resolutions[1])  # LG Mode
-
-# Manually add screens with holograms
-screen_manager.add_screen(1, hg_hologram)  # Display HG hologram on screen 1
-# screen_manager.add_screen(2, lg_hologram)  # Uncomment to display LG hologram on screen 2
+# Manually add screens (black until their holograms are ready)
+screen_manager.add_screen(1)  # Screen 1
+# screen_manager.add_screen(2)  # Uncomment to use screen 2
+
+# Compute holograms in worker threads with predefined parameters, so the GUI comes up at once.
+# Each result is kept in `holograms` for the updates below (the signals are delivered by the
+# event loop, so store_hologram only runs once app.exec_() has started).
+holograms = {}
+hg_task = HologramTask(HoloHG, m=3, n=2, w0=0.5, LA=0.001, SLM_Pix=resolutions[1])  # HG Mode
+hg_task.signals.done.connect(lambda U: store_hologram('HG', U))
+hg_task.signals.done.connect(lambda U: screen_manager.update_screen(1, U))  # Display HG hologram on screen 1
+lg_task = HologramTask(HoloLG, l=2, p=1, w0=0.6, LA=0.0015, SLM_Pix=resolutions[1])  # LG Mode
+lg_task.signals.done.connect(lambda U: store_hologram('LG', U))
+hg_task.start()
+lg_task.start()
+# screen_manager.compute_screen(2, HoloLG, l=2, p=1, w0=0.6, LA=0.0015, SLM_Pix=resolutions[2])  # Uncomment to display LG hologram on screen 2
 
 # ==========================
 # Hologram Update Functionality
@@ -65,9 +74,16 @@ def update_screen(index,U):
     print("Updating Screen 1...")
     screen_manager.update_screen(1, U)
 
-# Set timers for updating the screen with different holograms at specific intervals
-QTimer.singleShot(3000, lambda: update_screen(index,lg_hologram))  # Update to LG hologram after 3 seconds
-QTimer.singleShot(5000, lambda: update_screen(index,hg_hologram))  # Revert to HG hologram after 5 seconds
+def store_hologram(name, U):
+    """
+    Keeps a computed hologram and, once both are ready, starts the timed updates (the first
+    run also compiles the kernels, so the holograms may take longer than the timers).
+    """
+    holograms[name] = U
+    if len(holograms) == 2:
+        # Set timers for updating the screen with different holograms at specific intervals
+        QTimer.singleShot(3000, lambda: update_screen(1, holograms['LG']))  # Update to LG hologram after 3 seconds
+        QTimer.singleShot(5000, lambda: update_screen(1, holograms['HG']))  # Revert to HG hologram after 5 seconds
 
 # ==========================
 # Running the Application
@@ -1,5 +1,6 @@
 import numpy as np
-from optics import cart2pol, LG, HG, Zernike, propTF
+from functools import lru_cache
+from optics import cart2pol, LG, HG, Zernike, propTF_steps
 
 
 
@@ -12,13 +13,17 @@ def Hologram(A, hx, hy, LA):
             - hx, hy: Spacing in x and y directions.
             - LA: Grating period in the hologram.
     """
-    # Normalize the input beam
-    nn = np.sum(np.abs(A)**2) * hx * hy
-    NU = A / np.sqrt(nn)
-
     # Compute amplitude and phase patterns
-    Amp = np.abs(NU)
-    PHI = np.angle(NU)
+    return _encode(np.abs(A), np.angle(A), hx, hy, LA)
+
+
+def _encode(Amp, PHI, hx, hy, LA):
+    """
+    Hologram of a beam given by its amplitude and its phase (which need not be wrapped).
+    """
+    # Normalize the input beam
+    nn = np.sum(Amp**2) * hx * hy
+    Amp = Amp / np.sqrt(nn)
 
     # Generate grating
     mm = Amp.shape
@@ -40,26 +45,13 @@ def Hologram(A, hx, hy, LA):
     # Return the full hologram
     return M * F
 
-def HoloLG(l, p, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024, 780), position=(0, 0)):
+@lru_cache(maxsize=8)
+def _grid(SLM_Pix, maxx, position, dtype=np.float64):
     """
-    Generate a Laguerre-Gaussian beam hologram.
-    
-    Parameters:
-        - l (int): Azimuthal index (orbital angular momentum quantum number).
-        - p (int): Radial index.
-        - w0 (float): Beam waist (radius at which the beam's intensity drops to 1/e^2).
-        - z (tuple): Propagation parameters (z[0]: propagation distance, z[1]: steps).
-        - Z (tuple): Zernike polynomial parameters (Z[0]: normalization, Z[1]: strength,
-                      Z[2], Z[3]: indices for the Zernike polynomial).
-        - LA (float): Grating period (used to control diffraction properties).
-        - maxx (float): Size of the simulation window along the x-axis (half-width).
-        - SLM_Pix (tuple): Resolution of the spatial light modulator (width, height).
-        - position (tuple): Displacement of the beam's center in x and y directions.
-    
-    Returns:
-        - numpy.ndarray: A 2D array representing the generated Laguerre-Gaussian hologram.
+    Cartesian and polar coordinates of the SLM window, in the given real dtype, the pixel
+    spacing and the half-height of the window. The arrays are shared between calls, so they
+    are read-only.
     """
-    
     # Aspect ratio of the simulation window
     rate = SLM_Pix[1] / SLM_Pix[0]  # Assuming square pixels
     maxy = rate * maxx  # Scaling the Y-axis based on aspect ratio
@@ -78,36 +70,43 @@ def HoloLG(l, p, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024,
     # Convert Cartesian coordinates to polar coordinates
     r, phi = cart2pol(xx, yy)
 
-    # Apply Zernike polynomial mask for wavefront correction
-    ZPM = Zernike(r / Z[0], phi, Z[2], Z[3])
+    xx, yy, r, phi = (arr.astype(dtype, copy=False) for arr in (xx, yy, r, phi))
+    for arr in (xx, yy, r, phi):
+        arr.setflags(write=False)
+    return xx, yy, r, phi, dx, dy, maxy
 
-    # Generate the Laguerre-Gaussian beam field with Zernike corrections
-    A = LG(r, phi, l, p, w0) * np.exp(1j * 2 * np.pi * Z[1] * ZPM)
 
-    # Propagation logic if a propagation distance is specified
-    if z[0] > 0:
-        # Define propagation space with uniform step sizes
-        ZZ = np.linspace(0, z[0], z[1])
-        dz = np.abs(ZZ[0] - ZZ[1])  # Step size
+@lru_cache(maxsize=8)
+def _zernike_mask(Z, SLM_Pix, maxx, position, dtype=np.float64):
+    """
+    Zernike polynomial mask for wavefront correction on the SLM window (read-only), evaluated
+    on the grid of the beam (same dtype), so no extra float64 grid is built.
+    """
+    xx, yy, r, phi, dx, dy, maxy = _grid(SLM_Pix, maxx, position, dtype)
+    ZPM = Zernike(r / Z[0], phi, Z[2], Z[3]).astype(dtype, copy=False)
+    ZPM.setflags(write=False)
+    return ZPM
 
-        # Initialize a list to store the propagated field
-        F = [A]
 
-        # Iteratively propagate the beam through the specified distance
-        for _ in range(z[1]):
-            A = propTF(A, 2 * maxx, 1, dz)  # Fresnel propagation
-            F.append(A)
+@lru_cache(maxsize=8)
+def _hg_field(m, n, w0, SLM_Pix, maxx, position, dtype):
+    """
+    Hermite-Gaussian field on the SLM window (read-only), reused while the mode, the waist
+    and the window are unchanged.
+    """
+    xx, yy, r, phi, dx, dy, maxy = _grid(SLM_Pix, maxx, position, np.finfo(dtype).dtype)
+    field = HG(xx, yy, m, n, w0, dtype).real.copy()  # HG modes are real
+    field.setflags(write=False)
+    return field
 
-    # Generate the hologram from the resulting field
-    return Hologram(A, dx, dy, LA)
 
-def HoloHG(m, n, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024, 780), position=(0, 0)):
+def HoloLG(l, p, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024, 780), position=(0, 0), dtype=np.complex64):
     """
-    Generate a Hermite-Gaussian beam hologram.
+    Generate a Laguerre-Gaussian beam hologram.
     
     Parameters:
-        - m (int): Order in the horizontal direction
-        - n (int): Order in the vertical direction
+        - l (int): Azimuthal index (orbital angular momentum quantum number).
+        - p (int): Radial index.
         - w0 (float): Beam waist (radius at which the beam's intensity drops to 1/e^2).
         - z (tuple): Propagation parameters (z[0]: propagation distance, z[1]: steps).
         - Z (tuple): Zernike polynomial parameters (Z[0]: normalization, Z[1]: strength,
@@ -116,33 +115,21 @@ def HoloHG(m, n, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024,
         - maxx (float): Size of the simulation window along the x-axis (half-width).
         - SLM_Pix (tuple): Resolution of the spatial light modulator (width, height).
         - position (tuple): Displacement of the beam's center in x and y directions.
+        - dtype (numpy dtype): Complex dtype of the beam field (single precision by default).
     
     Returns:
         - numpy.ndarray: A 2D array representing the generated Laguerre-Gaussian hologram.
     """
-    # Aspect ratio of the simulation window
-    rate = SLM_Pix[1] / SLM_Pix[0]  # Assuming square pixels
-    maxy = rate * maxx  # Scaling the Y-axis based on aspect ratio
-
-    # Define the simulation space and include beam displacement
-    X = np.linspace(-maxx, maxx, SLM_Pix[0]) + position[0]
-    Y = -np.linspace(-maxy, maxy, SLM_Pix[1]) + position[1]
-
-    # Calculate spacing between pixels
-    dx = np.abs(X[1] - X[2])
-    dy = np.abs(Y[1] - Y[2])
-
-    # Create a meshgrid for Cartesian coordinates
-    xx, yy = np.meshgrid(X, Y)
-
-    # Convert Cartesian coordinates to polar coordinates
-    r, phi = cart2pol(xx, yy)
-
-    # Apply Zernike polynomial mask for wavefront correction
-    ZPM = Zernike(r / Z[0], phi, Z[2], Z[3])
+    
+    # Simulation space, polar coordinates and Zernike mask (cached per window and correction)
+    SLM_Pix, position, Z = tuple(SLM_Pix), tuple(position), tuple(Z)
+    real_dtype = np.finfo(dtype).dtype
+    xx, yy, r, phi, dx, dy, maxy = _grid(SLM_Pix, maxx, position, real_dtype)
 
-    # Generate the Laguerre-Gaussian beam field with Zernike corrections
-    A = HG(xx, yy, m, n, w0) * np.exp(1j * 2 * np.pi * Z[1] * ZPM)
+    # Generate the Laguerre-Gaussian beam field with Zernike corrections (skipped at zero strength)
+    A = LG(r, phi, l, p, w0, dtype)
+    if Z[1] != 0:
+        A = A * np.exp(1j * 2 * np.pi * Z[1] * _zernike_mask(Z, SLM_Pix, maxx, position, real_dtype))
 
     # Propagation logic if a propagation distance is specified
     if z[0] > 0:
@@ -150,13 +137,59 @@ def HoloHG(m, n, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024,
         ZZ = np.linspace(0, z[0], z[1])
         dz = np.abs(ZZ[0] - ZZ[1])  # Step size
 
-        # Initialize a list to store the propagated field
-        F = [A]
+        # Iteratively propagate the beam through the specified distance (Fresnel propagation)
+        A = propTF_steps(A, 2 * maxx, 2 * maxy, 1, dz, z[1], dtype)
+
+    # Generate the hologram from the resulting field
+    return Hologram(A, dx, dy, LA)
 
-        # Iteratively propagate the beam through the specified distance
-        for _ in range(z[1]):
-            A = propTF(A, 2 * maxx, 1, dz)  # Fresnel propagation
-            F.append(A)
+def HoloHG(m, n, w0, z=(0, 5), Z=(1, 0, 0, 0), LA=0.005, maxx=1, SLM_Pix=(1024, 780), position=(0, 0), dtype=np.complex64):
+    """
+    Generate a Hermite-Gaussian beam hologram.
+    
+    Parameters:
+        - m (int): Order in the horizontal direction
+        - n (int): Order in the vertical direction
+        - w0 (float): Beam waist (radius at which the beam's intensity drops to 1/e^2).
+        - z (tuple): Propagation parameters (z[0]: propagation distance, z[1]: steps).
+        - Z (tuple): Zernike polynomial parameters (Z[0]: normalization, Z[1]: strength,
+                      Z[2], Z[3]: indices for the Zernike polynomial).
+        - LA (float): Grating period (used to control diffraction properties).
+        - maxx (float): Size of the simulation window along the x-axis (half-width).
+        - SLM_Pix (tuple): Resolution of the spatial light modulator (width, height).
+        - position (tuple): Displacement of the beam's center in x and y directions.
+        - dtype (numpy dtype): Complex dtype of the beam field (single precision by default).
+    
+    Returns:
+        - numpy.ndarray: A 2D array representing the generated Laguerre-Gaussian hologram.
+    """
+    # Simulation space, Zernike mask and beam field (cached per window, correction and mode)
+    SLM_Pix, position, Z, dtype = tuple(SLM_Pix), tuple(position), tuple(Z), np.dtype(dtype)
+    real_dtype = np.finfo(dtype).dtype
+    xx, yy, r, phi, dx, dy, maxy = _grid(SLM_Pix, maxx, position, real_dtype)
+    # Zernike correction, only built when it has a nonzero strength
+    ZPM = _zernike_mask(Z, SLM_Pix, maxx, position, real_dtype) if Z[1] != 0 else None
+
+    # Generate the Hermite-Gaussian beam field
+    HGF = _hg_field(m, n, w0, SLM_Pix, maxx, position, dtype)
+
+    if z[0] <= 0:
+        # Without propagation the field is real, so its phase is 0 or pi, and the Zernike
+        # correction only adds to it: no complex field, exponential or angle is needed
+        PHI = np.where(HGF < 0, real_dtype.type(np.pi), real_dtype.type(0))
+        if ZPM is not None:
+            PHI += (2 * np.pi * Z[1]) * ZPM
+        return _encode(np.abs(HGF), PHI, dx, dy, LA)
+
+    # Zernike corrections
+    A = HGF * np.exp(1j * 2 * np.pi * Z[1] * ZPM) if ZPM is not None else HGF
+
+    # Propagation over the specified distance, with uniform step sizes
+    ZZ = np.linspace(0, z[0], z[1])
+    dz = np.abs(ZZ[0] - ZZ[1])  # Step size
+
+    # Iteratively propagate the beam through the specified distance (Fresnel propagation)
+    A = propTF_steps(A, 2 * maxx, 2 * maxy, 1, dz, z[1], dtype)
 
     # Generate the hologram from the resulting field
     return Hologram(A, dx, dy, LA)
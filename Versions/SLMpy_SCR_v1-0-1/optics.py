@@ -1,5 +1,47 @@
 import numpy as np
 import math
+import os
+from functools import lru_cache
+
+# Compiled Hermite and Laguerre polynomials when SciPy is installed (NHermite and Horner's
+# scheme in NlaguerreL below otherwise)
+try:
+    from scipy.special import eval_hermite, eval_genlaguerre
+except ImportError:
+    eval_hermite = eval_genlaguerre = None
+
+# Fused LG kernel when Numba is installed (NumPy expression below otherwise)
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# FFT backend for propTF: pyFFTW with cached plans, else multithreaded scipy.fft, else numpy.fft
+try:
+    import pyfftw
+    import pyfftw.interfaces.numpy_fft as _fft
+    pyfftw.interfaces.cache.enable()
+    _fft_kwargs = {'threads': os.cpu_count() or 1}
+except ImportError:
+    try:
+        import scipy.fft as _fft
+        _fft_kwargs = {'workers': -1}
+    except ImportError:
+        _fft = np.fft
+        _fft_kwargs = {}
+
+# CUDA propagation from optics_gpu.py when CuPy and a GPU are available. CuPy raises its own
+# CUDA errors (not ImportError) when it is installed on a machine without a usable device.
+try:
+    import cupy as cp
+    cp.cuda.runtime.getDeviceCount()
+    import optics_gpu
+except Exception:
+    optics_gpu = None
+
+# Smallest grid (in pixels) propagated on the GPU; below it the host-device copies cost more
+# than the FFTs they save
+GPU_MIN_PIXELS = 512 * 512
 
 def cart2pol(x, y):
     rho = np.sqrt(x**2 + y**2)
@@ -17,6 +59,7 @@ def cart2pol(x, y):
 # - m, n: Azimuthal and radial indices.
 
 # Coeffcients and powers or the radial Polynomials
+@lru_cache(maxsize=128)
 def RR(m,n):
     """
     Compute coefficients and powers for the radial polynomial of Zernike functions.
@@ -26,7 +69,8 @@ def RR(m,n):
         - n (int): Radial index.
 
     Returns:
-        - list: Coefficients and powers for the radial polynomial.
+        - tuple: Coefficients and powers for the radial polynomial (cached per (m, n), so
+          immutable tuples are returned).
     """
     coeff = []  # List to store coefficients
     pow = []    # List to store corresponding powers
@@ -34,12 +78,9 @@ def RR(m,n):
     # Zernike radial polynomials exist only if (n - m) is even
     if (n - m) % 2 == 0:
         for kk in range(0, int((n - m) / 2 + 1)):
-            # Compute the coefficient for the current term using factorials
-            aa = ((-1) ** kk * math.factorial(int(n - kk))) / (
-                math.factorial(int(kk)) *
-                math.factorial(int((n + m) / 2 - kk)) *
-                math.factorial(int((n - m) / 2 - kk))
-            )
+            # Coefficient (-1)^k (n-k)! / (k! ((n+m)/2-k)! ((n-m)/2-k)!) written as a product of
+            # binomials, which avoids the large intermediate factorials
+            aa = float((-1) ** kk * math.comb(n - kk, kk) * math.comb(n - 2 * kk, (n - m) // 2 - kk))
             # Compute the corresponding power
             bb = n - 2 * kk
             coeff.append(aa)
@@ -49,7 +90,7 @@ def RR(m,n):
         coeff.append(0)
         pow.append(0)
 
-    return [coeff, pow]  # Return the coefficients and powers as a list
+    return tuple(coeff), tuple(pow)  # Return the coefficients and powers as tuples
 
 
 def Zernike(RHO, PHI, m, n):
@@ -66,7 +107,7 @@ def Zernike(RHO, PHI, m, n):
 
     """
     ZR = np.zeros(RHO.shape)  # Initialize the Zernike radial polynomial
-    rn = RR(np.abs(m), n)     # Compute radial coefficients and powers
+    rn = RR(abs(int(m)), int(n))  # Radial coefficients and powers (cached)
 
     # Evaluate the radial polynomial using the precomputed coefficients
     for ii in range(len(rn[0])):
@@ -92,6 +133,11 @@ def Zernike(RHO, PHI, m, n):
 ################################################################################
 
 
+# Highest Laguerre order evaluated with Horner's scheme on the explicit coefficients (about
+# twice as fast as the recurrence, and accurate to ~1e-11 relative up to this order)
+HORNER_MAX_ORDER = 12
+
+
 def NlaguerreL(n, a, X):
     """
     Compute the generalized Laguerre polynomial numerically.
@@ -104,21 +150,57 @@ def NlaguerreL(n, a, X):
         - numpy.ndarray: Values of the generalized Laguerre polynomial.
         
     """
-    LL = 0  # Initialize the result
-    # Iterate over each term in the polynomial expansion
-    for m in range(n + 1):
-        # Compute each term using the formula for Laguerre polynomials
-        term = (
-            ((-1) ** m) * math.factorial(n + a) /
-            (math.factorial(n - m) * math.factorial(a + m) * math.factorial(m)) *
-            (X ** m)
-        )
-        LL += term  # Accumulate the result
+    if n > HORNER_MAX_ORDER and eval_genlaguerre is not None:
+        # The alternating coefficients cancel at high orders: use the (stable) three-term recurrence
+        return eval_genlaguerre(int(n), a, X).astype(np.result_type(X, np.float32), copy=False)
+
+    # Integral a keeps the exact binomial coefficients; any other a goes through math.gamma
+    coeffs = _laguerre_coeffs(int(n), int(a) if a == int(a) else float(a))
+    # Horner's scheme, from the highest power down
+    LL = np.full(np.shape(X), coeffs[-1], dtype=np.result_type(X, np.float32))
+    for c in coeffs[-2::-1]:
+        LL = LL * X + c
     return LL
 
 
-
-def LG(RHO, PHI, ell, p, w0):
+@lru_cache(maxsize=128)
+def _laguerre_coeffs(n, a):
+    """
+    Coefficients of L_n^a(x) in increasing powers of x:
+    (-1)^m (n+a)! / ((n-m)! (a+m)! m!) = (-1)^m C(n+a, n-m) / m!.
+    A non-integer a uses the Gamma function for the factorials of n+a and a+m.
+    """
+    if not isinstance(a, int):
+        return tuple((-1) ** m * math.gamma(n + a + 1) /
+                     (math.factorial(n - m) * math.gamma(a + m + 1) * math.factorial(m))
+                     for m in range(n + 1))
+    return tuple((-1) ** m * math.comb(n + a, n - m) / math.factorial(m) for m in range(n + 1))
+
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _lg_kernel(RHO, PHI, ell, w0, C, coeffs, out):
+        """
+        Laguerre-Gaussian field, pixel by pixel. coeffs are the Laguerre coefficients in
+        increasing powers (see _laguerre_coeffs), evaluated with Horner's scheme.
+        """
+        aell = abs(ell)
+        s = math.sqrt(2.0) / w0
+        for i in prange(RHO.shape[0]):
+            for j in range(RHO.shape[1]):
+                r = RHO[i, j]
+                u = (r / w0) ** 2
+                L = coeffs[coeffs.size - 1]
+                for k in range(coeffs.size - 2, -1, -1):
+                    L = L * (2.0 * u) + coeffs[k]
+                amp = C * math.exp(-u) * (s * r) ** aell * L
+                ph = ell * PHI[i, j]
+                out[i, j] = complex(amp * math.cos(ph), amp * math.sin(ph))
+        return out
+
+
+def LG(RHO, PHI, ell, p, w0, dtype=np.complex64):
     """
     Generate a Laguerre-Gaussian beam.
     
@@ -128,12 +210,24 @@ def LG(RHO, PHI, ell, p, w0):
         - ell (int): Azimuthal index (orbital angular momentum quantum number).
         - p (int): Radial index.
         - w0 (float): Beam waist (radius at which the beam's intensity drops to 1/e^2).
+        - dtype (numpy dtype): Complex dtype of the field (single precision by default).
     
     Returns:
         - numpy.ndarray: Complex field of the Laguerre-Gaussian beam.
     """
+    # Work on the grids in the real precision that matches the requested complex dtype
+    real_dtype = np.finfo(dtype).dtype
+    RHO = np.asarray(RHO, dtype=real_dtype)
+    PHI = np.asarray(PHI, dtype=real_dtype)
+
     # Normalization constant for the Laguerre-Gaussian mode
     C = np.sqrt((2 * math.factorial(p)) / (np.pi * math.factorial(p + np.abs(ell)))) * (1 / w0)
+
+    if njit is not None and p <= HORNER_MAX_ORDER and RHO.ndim == 2 and RHO.shape == PHI.shape:
+        # One pass over the grid, every factor computed per pixel in registers
+        coeffs = np.array(_laguerre_coeffs(int(p), abs(int(ell))))
+        field = np.empty(RHO.shape, dtype=dtype)
+        return _lg_kernel(RHO, PHI, int(ell), float(w0), float(C), coeffs, field)
     
     # Compute the Laguerre-Gaussian field
     field = (
@@ -143,7 +237,7 @@ def LG(RHO, PHI, ell, p, w0):
         np.exp(1j * ell * PHI) *  # Azimuthal phase factor
         NlaguerreL(p, np.abs(ell), 2 * (RHO / w0) ** 2)  # Laguerre polynomial
     )
-    return field
+    return field.astype(dtype, copy=False)
 
 
 
@@ -177,7 +271,7 @@ def NHermite(n, X):
             H = Hn  # Update H_{n-1} to H_n
     return H
 
-def HG(X, Y, m, n, w0):
+def HG(X, Y, m, n, w0, dtype=np.complex64):
     """
     # Generate a Hermite-Gaussian beam.
     
@@ -185,24 +279,85 @@ def HG(X, Y, m, n, w0):
         - X, Y (2D arrays): Cartesian coordinates.
         - m, n (int): Orders of the Hermite polynomial along x and y, respectively.
         - w0 (float): Beam waist (radius at which the beam's intensity drops to 1/e^2).
+        - dtype (numpy dtype): Complex dtype of the field (single precision by default).
     
     Returns:
         - numpy.ndarray: Complex field of the Hermite-Gaussian beam.
     """
+    # Work on the grids in the real precision that matches the requested complex dtype
+    real_dtype = np.finfo(dtype).dtype
+    X = np.asarray(X, dtype=real_dtype)
+    Y = np.asarray(Y, dtype=real_dtype)
+
     # Compute the spacing between grid points
     h = np.abs(X[0, 0] - X[0, 1])
 
-    # Calculate the Hermite-Gaussian field
-    field = (
-        NHermite(m, np.sqrt(2) * X / w0) *  # Hermite polynomial in X
-        NHermite(n, np.sqrt(2) * Y / w0) *  # Hermite polynomial in Y
-        np.exp(-(X ** 2 + Y ** 2) / w0 ** 2)  # Gaussian envelope
-    )
+    if (X == X[:1]).all() and (Y == Y[:, :1]).all():
+        # Meshgrid input: the field is separable, so evaluate each factor on its 1D axis
+        # (Hermite polynomial times its Gaussian) and take the outer product
+        x = X[0, :]
+        y = Y[:, 0]
+        hermite = eval_hermite if eval_hermite is not None else NHermite
+        Hx = hermite(m, np.sqrt(2) * x / w0) * np.exp(-(x / w0) ** 2)
+        Hy = hermite(n, np.sqrt(2) * y / w0) * np.exp(-(y / w0) ** 2)
+        field = np.multiply.outer(Hy.astype(real_dtype), Hx.astype(real_dtype))
+    else:
+        # Calculate the Hermite-Gaussian field
+        field = (
+            NHermite(m, np.sqrt(2) * X / w0) *  # Hermite polynomial in X
+            NHermite(n, np.sqrt(2) * Y / w0) *  # Hermite polynomial in Y
+            np.exp(-(X ** 2 + Y ** 2) / w0 ** 2)  # Gaussian envelope
+        )
     
-    # Normalize the field to ensure unit power
-    normalization = np.sum(h * h * np.abs(field) ** 2)
-    field = field / np.sqrt(normalization)
-    return field
+    # Normalize the field to ensure unit power (the field is real; the sum is kept in double)
+    normalization = h * h * np.einsum('ij,ij->', field, field, dtype=np.float64)
+    field /= np.sqrt(normalization)
+    return field.astype(dtype, copy=False)
+
+
+def _hermite_gauss_1d(x, k_max, w0):
+    """
+    Rows H_k(sqrt(2) x / w0) exp(-x^2 / w0^2) for k = 0..k_max, from the Hermite recurrence.
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    u = np.sqrt(2) * x / w0
+    H = np.empty((k_max + 1, x.size))
+    H[0] = 1  # H_0(u) = 1
+    if k_max > 0:
+        H[1] = 2 * u  # H_1(u) = 2u
+    for k in range(2, k_max + 1):
+        H[k] = 2 * u * H[k - 1] - 2 * (k - 1) * H[k - 2]  # H_k(u) = 2uH_{k-1}(u) - 2(k-1)H_{k-2}(u)
+    H *= np.exp(-(x / w0) ** 2)
+    return H
+
+
+def HG_basis(X1d, Y1d, m_max, n_max, w0):
+    """
+    Separable factors of all the Hermite-Gaussian modes up to (m_max, n_max) on one grid.
+
+    Each mode is then a single outer product, without re-evaluating any polynomial or
+    Gaussian: HG(m, n) = np.outer(Hy[n], Hx[m]) / norms[m, n], with rows along Y1d (as in
+    np.meshgrid(X1d, Y1d)).
+
+    Parameters:
+        - X1d, Y1d (1D arrays): Coordinates along x and y.
+        - m_max, n_max (int): Highest orders along x and y.
+        - w0 (float): Beam waist (radius at which the beam's intensity drops to 1/e^2).
+
+    Returns:
+        - Hx (numpy.ndarray): (m_max + 1, len(X1d)) array, row m is H_m(sqrt(2) x / w0) exp(-x^2 / w0^2).
+        - Hy (numpy.ndarray): (n_max + 1, len(Y1d)) array, the same along y.
+        - norms (numpy.ndarray): (m_max + 1, n_max + 1) array of the analytic mode norms
+          sqrt(2^(m+n) m! n! pi w0^2 / 2), which give unit power on a grid covering the beam.
+    """
+    Hx = _hermite_gauss_1d(X1d, m_max, w0)
+    Hy = _hermite_gauss_1d(Y1d, n_max, w0)
+
+    # 1D norms: integral of H_k(sqrt(2) x / w0)^2 exp(-2 x^2 / w0^2) dx = 2^k k! w0 sqrt(pi / 2)
+    cx = np.sqrt([2.0 ** k * math.factorial(k) * w0 * np.sqrt(np.pi / 2) for k in range(m_max + 1)])
+    cy = np.sqrt([2.0 ** k * math.factorial(k) * w0 * np.sqrt(np.pi / 2) for k in range(n_max + 1)])
+    norms = np.outer(cx, cy)
+    return Hx, Hy, norms
 
 ################################################################################
 # Propagation and Utility Functions
@@ -228,7 +383,7 @@ def HG(X, Y, m, n, w0):
 # z       - Propagation distance
 # u2      - Complex Amplitude of the beam at the observation plane
 
-def propTF(u1,Lx,Ly,la,z):
+def propTF(u1,Lx,Ly,la,z,dtype=np.complex64):
     """
     Perform Fresnel propagation using the transfer function approach. 
     Based on Computational Fourier Optics by Voelz
@@ -239,11 +394,22 @@ def propTF(u1,Lx,Ly,la,z):
         - Lx, Ly (float): Side lengths of the simulation window in x and y directions.
         - la (float): Wavelength of the light.
         - z (float): Propagation distance.
+        - dtype (numpy dtype): Complex dtype used for the FFTs and the transfer function.
+
+    When CuPy and a GPU are available, grids of at least GPU_MIN_PIXELS are propagated on the
+    device through optics_gpu.propTF_gpu, which caches the transfer function there.
         
     Returns:
         - numpy.ndarray: Complex amplitude of the beam at the observation plane.
     
     """
+    if optics_gpu is not None and np.size(u1) >= GPU_MIN_PIXELS:
+        return cp.asnumpy(optics_gpu.propTF_gpu(u1, Lx, Ly, la, z, dtype))
+
+    # Single precision by default: half the memory traffic, and FFTW plans it separately
+    u1 = np.asarray(u1).astype(dtype, copy=False)
+    real_dtype = np.finfo(dtype).dtype
+
     # Determine the shape of the input field
     Yd, Xd = u1.shape
     
@@ -251,20 +417,42 @@ def propTF(u1,Lx,Ly,la,z):
     dx = Lx / Xd
     dy = Ly / Yd
 
-    # Define frequency grids for x and y directions
-    fx = np.arange(-1 / (2 * dx), 1 / (2 * dx), 1 / Lx)
-    fy = np.arange(-1 / (2 * dy), 1 / (2 * dy), 1 / Ly)
-    Fx, Fy = np.meshgrid(fx, fy)  # Create 2D frequency grids
+    # Define frequency grids for x and y directions, in FFT order so that no fftshift is needed
+    fx = np.fft.fftfreq(Xd, dx).astype(real_dtype)[None, :]  # Row vector, broadcast against the column below
+    fy = np.fft.fftfreq(Yd, dy).astype(real_dtype)[:, None]
 
-    # Compute the transfer function for Fresnel propagation
-    H = np.exp(-1j * np.pi * 0.25 * la * z * (Fx**2 + Fy**2))
+    # Compute the transfer function for Fresnel propagation, exponentiated in place
+    H = (fx * fx + fy * fy) * (-1j * np.pi * 0.25 * la * z)
+    np.exp(H, out=H)
 
     # Perform Fourier transform of the input field
-    U1 = np.fft.fftshift(np.fft.fft2(u1))
+    U1 = _fft.fft2(u1, **_fft_kwargs)
 
     # Apply the transfer function in the frequency domain
-    U2 = H * U1
+    U1 *= H
 
     # Transform back to the spatial domain
-    u2 = np.fft.ifft2(np.fft.ifftshift(U2))
-    return u2
\ No newline at end of file
+    u2 = _fft.ifft2(U1, **_fft_kwargs)
+    return u2.astype(dtype, copy=False)
+
+
+def propTF_steps(u1, Lx, Ly, la, dz, steps, dtype=np.complex64):
+    """
+    Propagate a field with propTF in `steps` steps of length dz.
+
+    On the GPU (same conditions as propTF) the field stays on the device between the steps and
+    the transfer function is built once, so only the first and last copies cross the bus.
+
+    Returns:
+        - numpy.ndarray: Complex amplitude of the beam after the last step.
+    """
+    if optics_gpu is not None and np.size(u1) >= GPU_MIN_PIXELS:
+        u = cp.asarray(u1, dtype=dtype)
+        for _ in range(steps):
+            u = optics_gpu.propTF_gpu(u, Lx, Ly, la, dz, dtype)
+        return cp.asnumpy(u)
+
+    u = u1
+    for _ in range(steps):
+        u = propTF(u, Lx, Ly, la, dz, dtype)
+    return u
@@ -1,25 +1,45 @@
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from PyQt5.QtWidgets import QMainWindow, QApplication
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QMainWindow, QApplication, QLabel
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 
-# Ensure QApplication is created before any GUI elements
-app = QApplication.instance() or QApplication([])
+# Phase -> gray level table: [0, 2 pi) is split in LUT_SIZE bins, each mapped to its 8-bit level.
+# A calibrated SLM can use its own table (SLMScreen.lut) at no extra cost per frame.
+LUT_SIZE = 1024
+LINEAR_LUT = (np.arange(LUT_SIZE) * 256 // LUT_SIZE).astype(np.uint8)
+
+_app = None  # Reference that keeps the QApplication alive once it has been created
+
+
+def get_app():
+    """
+    Returns the running QApplication, creating it on first use. Qt is only started when a
+    screen is actually needed, so importing this module (e.g. in batch jobs) stays cheap.
+    """
+    global _app
+    if _app is None:
+        _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
 
 # Screen Controller Class
 class SLMScreen(QMainWindow):
-    def __init__(self, screen_index=0, hologram=None):
+    def __init__(self, screen_index=0, hologram=None, lut=None):
         """
         Initializes an SLM screen window.
 
         Parameters:
             - screen_index (int): The index of the screen.
-            - hologram (numpy.ndarray): The precomputed hologram to display.
+            - hologram (numpy.ndarray): The precomputed hologram to display. Without one the
+              screen stays black until display() is called (e.g. from a HologramTask).
+            - lut (numpy.ndarray): LUT_SIZE uint8 gray levels for the phases k 2 pi / LUT_SIZE,
+              e.g. the calibration curve of the SLM. Linear by default.
         """
+        get_app()  # QApplication must exist before any GUI elements
         super().__init__()
 
         self.screen_index = screen_index
+        self.lut = LINEAR_LUT if lut is None else np.asarray(lut, dtype=np.uint8)
         self.screens = QApplication.screens()
 
         if self.screen_index >= len(self.screens):
@@ -29,44 +49,99 @@ class SLMScreen(QMainWindow):
         self.screen_geometry = self.screens[self.screen_index].geometry()
         self.resolution = (self.screen_geometry.width(), self.screen_geometry.height())
 
-        # Set up matplotlib figure
-        self.figure, self.ax = plt.subplots(figsize=(self.resolution[0] / 100, self.resolution[1] / 100))
-        self.figure.subplots_adjust(left=0, right=1, top=1, bottom=0)
-        self.ax.set_axis_off()
-        self.canvas = FigureCanvas(self.figure)
+        # The hologram is drawn as an 8-bit grayscale image on a bare label
+        self.label = QLabel()
+        self.label.setAlignment(Qt.AlignCenter)
+        self._levels = None  # uint8 buffer behind the current QImage, kept alive while shown
 
         # Configure PyQt window
-        self.setCentralWidget(self.canvas)
+        self.setCentralWidget(self.label)
         self.setWindowFlags(Qt.FramelessWindowHint)
         self.setGeometry(self.screen_geometry)
         self.showFullScreen()
 
-        # Display the initial hologram (if provided)
-        if hologram is not None:
-            self.display(hologram)
+        # Display the initial hologram (if provided), or a black screen
+        self.display(hologram if hologram is not None else np.zeros((1, 1), dtype=np.float32))
 
     def display(self, array):
-        """Displays the given hologram pattern on the screen."""
-        scale_x = self.resolution[1] / array.shape[0]
-        scale_y = self.resolution[0] / array.shape[1]
-        resized_array = np.kron(array, np.ones((int(scale_x), int(scale_y))))  # Resize array
+        """
+        Displays the given hologram pattern on the screen.
+
+        The phase is wrapped to [0, 2 pi) and mapped to gray levels through the lookup table,
+        and the image is scaled to the screen by Qt (nearest neighbour), without going through
+        matplotlib.
+        """
+        self.show_levels(self.quantize(array))
+
+    def quantize(self, array):
+        """Maps a phase hologram to the C-contiguous uint8 gray levels of this SLM."""
+        idx = np.multiply(array, np.float32(LUT_SIZE / (2 * np.pi)), dtype=np.float32).astype(np.int32)
+        idx &= LUT_SIZE - 1  # Wraps the phase (LUT_SIZE is a power of two)
+        return np.ascontiguousarray(self.lut.take(idx))
+
+    def show_levels(self, levels):
+        """
+        Displays uint8 gray levels (from quantize) as they are. The QImage is a view of the
+        array, which is kept referenced while it is shown and may be shared with other screens.
+        """
+        self._levels = levels
+
+        height, width = self._levels.shape
+        image = QImage(self._levels.data, width, height, self._levels.strides[0], QImage.Format_Grayscale8)
+        pixmap = QPixmap.fromImage(image).scaled(self.resolution[0], self.resolution[1],
+                                                 Qt.IgnoreAspectRatio, Qt.FastTransformation)
+        self.label.setPixmap(pixmap)
+
+class _HologramSignals(QObject):
+    done = pyqtSignal(object)  # The computed hologram
+    failed = pyqtSignal(object)  # The exception raised while computing it
+
 
-        self.ax.clear()
-        self.ax.imshow(resized_array, cmap="gray", aspect="auto")
-        self.ax.set_axis_off()
-        self.canvas.draw()
+class HologramTask(QRunnable):
+    """
+    Computes a hologram in Qt's thread pool, so the GUI keeps running meanwhile.
+
+    The result of func(*args, **kwargs) is emitted with signals.done, or the exception it
+    raised with signals.failed (an exception escaping run() would abort the application).
+    Connect to them from the GUI thread, before start(): the connected slots then run in the
+    GUI thread as well.
+    """
+    def __init__(self, func, *args, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _HologramSignals()
+
+    def run(self):
+        try:
+            hologram = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            print(f"[ERROR] Failed to generate hologram with {getattr(self.func, '__name__', self.func)}: {e}")
+            self.signals.failed.emit(e)
+            return
+        self.signals.done.emit(hologram)
+
+    def start(self):
+        """Queues the task on the global thread pool and returns it."""
+        QThreadPool.globalInstance().start(self)
+        return self
 
 # **Screen Manager: Handles Individual Screens Only**
 class ScreenManager:
     def __init__(self):
         """Initializes an empty screen manager."""
+        get_app()
         self.screens = {}
         
 
-    def add_screen(self, screen_index, hologram):
-        """Adds a new screen and displays the initial hologram."""
+    def add_screen(self, screen_index, hologram=None, lut=None):
+        """
+        Adds a new screen and displays the initial hologram (black if there is none yet).
+        lut is the phase to gray level table of its SLM (see SLMScreen).
+        """
         try:
-            self.screens[screen_index] = SLMScreen(screen_index=screen_index, hologram=hologram)
+            self.screens[screen_index] = SLMScreen(screen_index=screen_index, hologram=hologram, lut=lut)
         except ValueError as e:
             print(e)
 
@@ -77,6 +152,30 @@ class ScreenManager:
         else:
             print(f"Screen {screen_index} not found.")
 
+    def update_screens(self, screen_indices, hologram):
+        """
+        Updates several screens with the same hologram. It is quantized once per lookup table,
+        and the screens using the same table share that uint8 buffer instead of one copy each.
+        """
+        shared = {}  # id(lut) -> (lut, levels); the lut is kept so its id stays unique
+        for screen_index in screen_indices:
+            screen = self.screens.get(screen_index)
+            if screen is None:
+                print(f"Screen {screen_index} not found.")
+                continue
+            if id(screen.lut) not in shared:
+                shared[id(screen.lut)] = (screen.lut, screen.quantize(hologram))
+            screen.show_levels(shared[id(screen.lut)][1])
+
+    def compute_screen(self, screen_index, func, *args, **kwargs):
+        """
+        Computes a hologram with func(*args, **kwargs) in a worker thread and displays it on
+        the screen once it is ready.
+        """
+        task = HologramTask(func, *args, **kwargs)
+        task.signals.done.connect(lambda hologram: self.update_screen(screen_index, hologram))
+        task.start()
+
     def get_screen_resolutions(self):
         """Returns a dictionary with the resolutions of all available screens."""
         screen_list = QApplication.screens()